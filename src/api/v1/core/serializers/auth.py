@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from core.api.tokens import FilteredRefreshToken, verify_tokens
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    token_class = FilteredRefreshToken
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
+
+    def validate(self, attrs):
+        # Soft-deleted users are hidden from the default manager, which simplejwt doesn't expect
+        try:
+            return super().validate(attrs)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+
+class TokenVerifySerializer(serializers.Serializer):
+    """
+    Verifies a single `token`, or a batch of up to `MAX_BATCH_SIZE` `tokens` in one request.
+
+    A single invalid token is rejected like simplejwt's TokenVerifySerializer does,
+    a batch always succeeds with a result per token, in the same order.
+    """
+
+    MAX_BATCH_SIZE = 100
+
+    token = serializers.CharField(required=False, write_only=True)
+    tokens = serializers.ListField(
+        child=serializers.CharField(), required=False, write_only=True, max_length=MAX_BATCH_SIZE
+    )
+
+    def validate(self, attrs):
+        if ("token" in attrs) == ("tokens" in attrs):
+            raise serializers.ValidationError(_("Provide either token or tokens."))
+
+        if "token" in attrs:
+            error = verify_tokens([attrs["token"]])[0]
+            if error is not None:
+                raise TokenError(error)
+            return {"detail": _("Token is valid")}
+
+        return {
+            "results": [
+                {"valid": True} if error is None else {"valid": False, "detail": error}
+                for error in verify_tokens(attrs["tokens"])
+            ]
+        }
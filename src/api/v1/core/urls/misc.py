@@ -1,10 +1,12 @@
 from django.urls import path
 
-from api.v1.core.views.misc import HealthAPIView, TestAPIView
+from api.v1.core.views.misc import HealthAPIView, LivenessView, ReadinessView, TestAPIView
 
 app_name = "misc"
 
 urlpatterns = [
     path("health/", HealthAPIView.as_view(), name="health-api"),
+    path("live/", LivenessView.as_view(), name="liveness"),
+    path("ready/", ReadinessView.as_view(), name="readiness"),
     path("test/", TestAPIView.as_view(), name="test-api"),
 ]
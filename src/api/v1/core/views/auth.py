@@ -1,29 +1,23 @@
-from rest_framework_simplejwt.serializers import TokenVerifySerializer
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
 
+from api.v1.core.serializers.auth import LoginSerializer, RefreshSerializer, TokenVerifySerializer
 from core.api.views import BaseAPIView
+from core.utils.throttling import LoginThrottle
 
 
 class LoginAPIView(TokenObtainPairView, BaseAPIView):
-    pass
+    serializer_class = LoginSerializer
+    throttle_classes = (LoginThrottle,)
+    throttle_scope = "login"
 
 
 class RefreshAPIView(TokenRefreshView, BaseAPIView):
-    pass
+    serializer_class = RefreshSerializer
 
 
 class TokenVerifyAPIView(TokenVerifyView, BaseAPIView):
-
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-
-        if response.status_code == 200:
-            serializer = TokenVerifySerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            response.data = {"detail": "Token is valid"}
-
-        return response
+    serializer_class = TokenVerifySerializer
@@ -1,6 +1,14 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views import View
 from rest_framework import generics
 from rest_framework.response import Response
 
+from core.utils.health import health_checker
+from core.utils.metrics import CONTENT_TYPE, collect_metrics
+
 
 class HealthAPIView(generics.RetrieveAPIView):
     permission_classes = []
@@ -14,3 +22,44 @@ class TestAPIView(generics.RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         return Response(data={"message": "This is a test endpoint."}, status=200)
+
+
+class LivenessView(View):
+    """
+    Whether the process serves requests at all. Touches nothing else, never fails otherwise.
+
+    Like the other probes, a plain Django view: no authentication, throttling or response envelope.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({"status": "ok"})
+
+
+class ReadinessView(View):
+    """
+    Whether the dependencies of the process are healthy (503 otherwise), see `core.utils.health`.
+    The report is cached for `HEALTH_CACHE_TTL` seconds.
+    """
+
+    def get(self, request, *args, **kwargs):
+        report = health_checker.get_report()
+        return JsonResponse(report, status=200 if report["status"] == "ok" else 503)
+
+
+class MetricsView(View):
+    """
+    Metrics of every worker process in the Prometheus text format.
+
+    A plain Django view, so scraping doesn't go through DRF's authentication and rendering.
+    The scraper must send `METRICS_TOKEN` as `Authorization: Bearer <token>`. Without a token
+    the endpoint doesn't exist (404), except with DEBUG.
+    """
+
+    def get(self, request, *args, **kwargs):
+        token = settings.METRICS_TOKEN
+        if not token:
+            if not settings.DEBUG:
+                raise Http404
+        elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401)
+        return HttpResponse(collect_metrics(), content_type=CONTENT_TYPE)
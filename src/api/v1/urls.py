@@ -1,9 +1,12 @@
 from django.urls import path, include
 
+from api.v1.core.views.misc import MetricsView
+
 app_name = "url_router"
 
 urlpatterns = [
     path("users/", include("api.v1.account.urls", namespace="account")),
     path("auth/", include("api.v1.core.urls.auth", namespace="auth")),
     path("misc/", include("api.v1.core.urls.misc", namespace="health")),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,7 +1,69 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List
+
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
+
+from core.managers import SoftDeleteManager, SoftDeleteQuerySet
+from core.utils.hashing import hash_passwords
+from core.utils.user_cache import invalidate_users
+
+
+class UserQuerySet(SoftDeleteQuerySet):
+    """
+    Invalidates the cached users of `CachedJWTAuthentication` on bulk changes, which skip `User.save()`.
+
+    `soft_delete()`, `restore()` and `bulk_update()` all go through `update()`,
+    the admin "delete selected" action through `delete()`.
+
+    Rows are changed in primary-key batches of at most `invalidation_batch_size` rows: the ids of
+    a batch are fetched, only those rows are written and exactly those users are invalidated.
+    Memory stays bounded and a row that starts matching in between is never changed unseen.
+    """
+
+    invalidation_batch_size = 1000
+
+    def update(self, **kwargs):
+        if self.query.is_sliced:
+            raise TypeError("Cannot update a query once a slice has been taken.")
+
+        rows = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for user_ids in self._iter_pk_batches():
+                batch_rows = super(UserQuerySet, self.filter(pk__in=user_ids)).update(**kwargs)
+                if batch_rows:
+                    invalidate_users(user_ids)
+                rows += batch_rows
+        return rows
 
+    update.alters_data = True
 
-class UserManager(BaseUserManager):
+    def _hard_delete_chunk(self) -> Dict[str, int]:
+        counts: Counter = Counter()
+        with transaction.atomic(using=self.db, savepoint=False):
+            for user_ids in self._iter_pk_batches():
+                deleted = super(UserQuerySet, self.filter(pk__in=user_ids))._hard_delete_chunk()
+                if deleted.get(self.model._meta.label):
+                    invalidate_users(user_ids)
+                counts.update(deleted)
+        return dict(counts)
+
+    def _iter_pk_batches(self) -> Iterator[List]:
+        """Yield the primary keys of the matched rows in ascending batches of `invalidation_batch_size`."""
+        queryset = self.order_by("pk").values_list("pk", flat=True)
+        last_pk = None
+        while True:
+            batch_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            user_ids = list(batch_queryset[: self.invalidation_batch_size])
+            if not user_ids:
+                return
+            yield user_ids
+            if len(user_ids) < self.invalidation_batch_size:
+                return
+            last_pk = user_ids[-1]
+
+
+class UserManager(SoftDeleteManager.from_queryset(UserQuerySet), BaseUserManager):
 
     def get_by_natural_key(self, username):
         """Returns the user by their username field."""
@@ -21,6 +83,30 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def bulk_create_users(self, users: Iterable[Dict], batch_size: int = 1000) -> List:
+        """
+        Creates users from dicts of field values, including a raw "password".
+
+        Passwords of every batch are hashed in parallel on the hashing executor,
+        then the batch is inserted with a single bulk_create().
+        Like bulk_create(), save() isn't called and no signals are sent.
+        """
+        created = []
+        batch = []
+        for fields in users:
+            batch.append(dict(fields))
+            if len(batch) >= batch_size:
+                created.extend(self._bulk_create_user_batch(batch))
+                batch = []
+        if batch:
+            created.extend(self._bulk_create_user_batch(batch))
+        return created
+
+    def _bulk_create_user_batch(self, batch: List[Dict]) -> List:
+        passwords = hash_passwords(fields.pop("password") for fields in batch)
+        objs = [self.model(password=password, **fields) for fields, password in zip(batch, passwords)]
+        return self.bulk_create(objs)
+
     def create_superuser(self, username, password=None, **extra_fields):
         """
         Creates and returns a superuser with username and password.
@@ -0,0 +1,66 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+from core.utils.migrations import AddConstraintConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built CONCURRENTLY, which can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("account", "0001_initial"),
+    ]
+
+    operations = [
+        # Build the partial indexes first, so lookups and uniqueness stay covered
+        # while the old full-table unique constraints are dropped
+        AddConstraintConcurrently(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("username",),
+                name="account_user_username_live_uniq",
+            ),
+        ),
+        AddConstraintConcurrently(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("email",),
+                name="account_user_email_live_uniq",
+            ),
+        ),
+        AddConstraintConcurrently(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("phone",),
+                name="account_user_phone_live_uniq",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["created_at"],
+                name="account_user_created_at_live",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="username",
+            field=models.CharField(max_length=150, verbose_name="Username"),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=models.EmailField(max_length=254, verbose_name="Email"),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="phone",
+            field=models.CharField(blank=True, max_length=15, null=True, verbose_name="Phone Number"),
+        ),
+    ]
@@ -2,8 +2,9 @@ from django.contrib.auth.base_user import AbstractBaseUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from core.models import TimestampedModel, SoftDeleteModel
-from django.contrib.auth.hashers import make_password
+from core.models import TimestampedModel, SoftDeleteModel, live_indexes, live_unique_constraints
+from core.utils.hashing import hash_password, is_password_hash, verify_password
+from core.utils.user_cache import invalidate_users
 
 from account import managers
 
@@ -14,9 +15,10 @@ class User(AbstractBaseUser, TimestampedModel, SoftDeleteModel):
     last_name = models.CharField(max_length=30, verbose_name=_("Last Name"), blank=True, null=True)
     patronymic = models.CharField(max_length=100, verbose_name=_("Patronymic"), blank=True, null=True)
 
-    username = models.CharField(max_length=150, unique=True, verbose_name=_("Username"))
-    phone = models.CharField(max_length=15, unique=True, verbose_name=_("Phone Number"), null=True, blank=True)
-    email = models.EmailField(unique=True, verbose_name=_("Email"))
+    # Uniqueness only applies to live users, see Meta.constraints
+    username = models.CharField(max_length=150, verbose_name=_("Username"))
+    phone = models.CharField(max_length=15, verbose_name=_("Phone Number"), null=True, blank=True)
+    email = models.EmailField(verbose_name=_("Email"))
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["first_name", "email"]
@@ -28,9 +30,14 @@ class User(AbstractBaseUser, TimestampedModel, SoftDeleteModel):
 
     objects = managers.UserManager()
 
+    # The password as last hashed or loaded, so unusable passwords ("!...") are never hashed again
+    _hashed_password = None
+
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        constraints = live_unique_constraints("username", "email", "phone")
+        indexes = live_indexes("created_at")
 
     def __str__(self):
         return f"{self.first_name} (@{self.get_username()})"
@@ -44,9 +51,46 @@ class User(AbstractBaseUser, TimestampedModel, SoftDeleteModel):
     def has_module_perms(self, app_label):
         return self.is_superuser
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._hashed_password = instance.__dict__.get("password")
+        return instance
+
+    def set_password(self, raw_password):
+        self.password = self._hashed_password = hash_password(raw_password)
+        self._password = raw_password
+
+    def set_unusable_password(self):
+        super().set_unusable_password()
+        self._hashed_password = self.password
 
-        if self.password and not self.password.startswith("pbkdf2_sha256$"):
-            self.password = make_password(self.password)  # Hash the password
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return verify_password(raw_password, self.password, setter)
+
+    def save(self, *args, **kwargs):
 
-        return super().save(*args, **kwargs)
+        # Hash raw passwords (e.g. set through the admin form), whatever hasher the stored ones were made with
+        if self.password and self.password != self._hashed_password and not is_password_hash(self.password):
+            self.password = hash_password(self.password)
+
+        result = super().save(*args, **kwargs)
+        self._hashed_password = self.password
+        # Cached copies used by CachedJWTAuthentication are stale now
+        invalidate_users([self.pk])
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_users([self.pk])
+        return result
+
+    def hard_delete(self, *args, **kwargs):
+        pk = self.pk
+        super().hard_delete(*args, **kwargs)
+        invalidate_users([pk])
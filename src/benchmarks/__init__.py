@@ -0,0 +1,64 @@
+"""
+Micro-benchmarks of the hot paths, run from `src/` with the project settings:
+
+    python -m benchmarks.<name>
+
+They are not collected by `manage.py test`.
+"""
+
+import asyncio
+import inspect
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+
+def setup() -> None:
+    """Configure Django the same way as manage.py."""
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "apps"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+    import django
+
+    django.setup()
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 100) -> Dict[str, float]:
+    """
+    Run `func` `iterations` times, return the throughput and the latency percentiles in ms.
+    Coroutine functions are awaited one call at a time on a single event loop.
+    """
+    if inspect.iscoroutinefunction(func):
+        loop = asyncio.new_event_loop()
+        coroutine_function = func
+
+        def func():
+            return loop.run_until_complete(coroutine_function())
+
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(timings, n=100)
+    return {
+        "ops/s": iterations / elapsed,
+        "p50 ms": percentiles[49] * 1000,
+        "p99 ms": percentiles[98] * 1000,
+    }
+
+
+def report(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Print the results of `measure` of several variants as a table."""
+    print(title)
+    for name, result in results.items():
+        values = "  ".join(f"{key} {value:>10.3f}" for key, value in result.items())
+        print(f"  {name:<30} {values}")
@@ -0,0 +1,77 @@
+"""
+Per-request cost of the middleware stack, through the test client (WSGI-style, sync) and the
+async test client (ASGI, async), on an API endpoint that touches nothing but the stack.
+
+    python -m benchmarks.middlewares
+
+Besides the configured `MIDDLEWARE`, two stacks are measured for comparison:
+    - "sync view/template hooks": every `AbstractMiddleware` of the stack also defines no-op
+      sync `process_view` and `process_template_response` hooks, which Django registers and
+      calls through a thread hop under ASGI
+    - "admin middlewares inline": the `ADMIN_MIDDLEWARE` stack runs for every request instead
+      of going through `PathDispatchMiddleware`
+"""
+
+import sys
+from functools import partial
+
+from benchmarks import measure, report, setup
+
+PATH = "/api/v1/misc/test/"
+
+
+def _with_sync_hooks(middleware_path: str) -> str:
+    """Return the import path of a subclass of the middleware with no-op sync view/template hooks."""
+    from django.utils.module_loading import import_string
+
+    from config.middlewares.abstract import AbstractMiddleware
+    from core.middlewares.dispatch import PathDispatchMiddleware
+
+    middleware = import_string(middleware_path)
+    if not issubclass(middleware, AbstractMiddleware) or issubclass(middleware, PathDispatchMiddleware):
+        return middleware_path
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return None
+
+    def process_template_response(self, request, response):
+        return response
+
+    name = f"SyncHooks{middleware.__name__}"
+    attrs = {"process_view": process_view, "process_template_response": process_template_response}
+    setattr(sys.modules[__name__], name, type(name, (middleware,), attrs))
+    return f"{__name__}.{name}"
+
+
+def get_stacks() -> dict:
+    from django.conf import settings
+
+    dispatch = "core.middlewares.dispatch.PathDispatchMiddleware"
+    index = settings.MIDDLEWARE.index(dispatch)
+    return {
+        "MIDDLEWARE": settings.MIDDLEWARE,
+        "sync view/template hooks": [_with_sync_hooks(path) for path in settings.MIDDLEWARE],
+        "admin middlewares inline": (
+            settings.MIDDLEWARE[:index] + settings.ADMIN_MIDDLEWARE + settings.MIDDLEWARE[index + 1 :]
+        ),
+    }
+
+
+def main() -> None:
+    setup()
+
+    from django.test import AsyncClient, Client
+    from django.test.utils import override_settings
+
+    iterations = 3000
+    for mode in ("sync", "async"):
+        results = {}
+        for name, middleware in get_stacks().items():
+            with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=["*"]):
+                client = Client() if mode == "sync" else AsyncClient()
+                results[name] = measure(partial(client.get, PATH), iterations)
+        report(f"GET {PATH} ({mode})", results)
+
+
+if __name__ == "__main__":
+    main()
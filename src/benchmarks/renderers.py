@@ -0,0 +1,53 @@
+"""
+FastJSONRenderer against DRF's JSONRenderer on paginated envelopes of serializer output.
+
+    python -m benchmarks.renderers
+"""
+
+from benchmarks import measure, report, setup
+
+
+def get_page(rows: int) -> dict:
+    from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+    results = ReturnList(
+        [
+            ReturnDict(
+                {
+                    "id": i,
+                    "username": f"user{i}",
+                    "first_name": "Первое имя",
+                    "last_name": None,
+                    "email": f"user{i}@example.com",
+                    "is_active": True,
+                    "created_at": "2025-01-02T03:04:05.678Z",
+                },
+                serializer=None,
+            )
+            for i in range(rows)
+        ],
+        serializer=None,
+    )
+    return {"success": True, "message": "OK", "results": results, "total_count": rows, "page": 1}
+
+
+def main() -> None:
+    setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from core.api.renderers import FastJSONRenderer
+
+    for rows, iterations in ((10, 20_000), (1000, 500)):
+        page = get_page(rows)
+        report(
+            f"Rendering a page of {rows} rows",
+            {
+                "JSONRenderer": measure(lambda: JSONRenderer().render(page), iterations),
+                "FastJSONRenderer": measure(lambda: FastJSONRenderer().render(page), iterations),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
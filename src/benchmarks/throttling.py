@@ -0,0 +1,69 @@
+"""
+Login under a credential stuffing attack, with and without LoginThrottle: a few client IPs
+trying wrong passwords against many usernames, as fast as they can.
+
+    python -m benchmarks.throttling
+
+Runs against a throwaway test database, created and destroyed like `manage.py test` does.
+Passwords are hashed inline (`PASSWORD_HASHING_WORKERS = 0`), so the CPU time of the
+process includes every password check the attack costs.
+"""
+
+import itertools
+import time
+
+from benchmarks import measure, report, setup
+
+PATH = "/api/v1/auth/login/"
+IPS = 5
+USERS = 20
+
+
+def main() -> None:
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from api.v1.core.views.auth import LoginAPIView
+    from core.utils.throttling import TokenBucketThrottle
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        with override_settings(PASSWORD_HASHING_WORKERS=0, ALLOWED_HOSTS=["*"]):
+            for i in range(USERS):
+                get_user_model().objects.create_user(f"user{i}", "password", first_name="User", email=f"{i}@b.com")
+
+            iterations = 200
+            results = {}
+            for name, throttle_classes in (("no throttle", ()), ("LoginThrottle", LoginAPIView.throttle_classes)):
+                cache.clear()
+                TokenBucketThrottle._buckets.clear()
+                attempts = itertools.cycle(
+                    (f"10.0.0.{i % IPS}", {"username": f"user{i % USERS}", "password": f"guess{i}"})
+                    for i in range(IPS * USERS)
+                )
+                client = Client()
+
+                def attempt():
+                    ip, data = next(attempts)
+                    client.post(PATH, data, content_type="application/json", REMOTE_ADDR=ip)
+
+                original, LoginAPIView.throttle_classes = LoginAPIView.throttle_classes, throttle_classes
+                try:
+                    cpu_start = time.process_time()
+                    results[name] = measure(attempt, iterations, warmup=0)
+                    results[name]["cpu ms"] = (time.process_time() - cpu_start) * 1000 / iterations
+                finally:
+                    LoginAPIView.throttle_classes = original
+            report(f"POST {PATH}, {IPS} IPs x {USERS} usernames, wrong passwords", results)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
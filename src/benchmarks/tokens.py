@@ -0,0 +1,96 @@
+"""
+Refresh token checks and full refreshes with FilteredRefreshToken against simplejwt's RefreshToken,
+which queries the blacklist on every check, with a large blacklist. Token verification, single
+and batched, with `verify_tokens` against simplejwt's TokenVerifySerializer.
+
+    python -m benchmarks.tokens
+
+Runs against a throwaway test database, created and destroyed like `manage.py test` does.
+"""
+
+from datetime import timedelta
+from uuid import uuid4
+
+from benchmarks import measure, report, setup
+
+BLACKLISTED = 50_000
+BATCH_SIZE = 100
+
+
+def populate(user) -> None:
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    expires_at = timezone.now() + timedelta(days=1)
+    outstanding = OutstandingToken.objects.bulk_create(
+        OutstandingToken(user=user, jti=uuid4().hex, token="", expires_at=expires_at) for _ in range(BLACKLISTED)
+    )
+    BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in outstanding)
+
+
+def main() -> None:
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import override_settings
+    from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from api.v1.core.serializers.auth import RefreshSerializer
+    from core.api.tokens import FilteredRefreshToken, verify_tokens
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        with override_settings(PASSWORD_HASHING_WORKERS=0):
+            user = get_user_model().objects.create_user("bench", "password", first_name="Bench", email="b@b.com")
+        populate(user)
+
+        iterations = 2000
+        raw_token = str(FilteredRefreshToken.for_user(user))
+        report(
+            f"Checking a refresh token ({BLACKLISTED} blacklisted)",
+            {
+                "RefreshToken": measure(lambda: RefreshToken(raw_token), iterations),
+                "FilteredRefreshToken": measure(lambda: FilteredRefreshToken(raw_token), iterations),
+            },
+        )
+
+        results = {}
+        for serializer_class in (TokenRefreshSerializer, RefreshSerializer):
+            # Rotation blacklists every refreshed token, each call needs a fresh one
+            raw_tokens = iter([str(FilteredRefreshToken.for_user(user)) for _ in range(iterations + 100)])
+
+            def refresh():
+                serializer_class(data={"refresh": next(raw_tokens)}).is_valid(raise_exception=True)
+
+            results[serializer_class.__name__] = measure(refresh, iterations)
+        report(f"Refreshing with rotation ({BLACKLISTED} blacklisted)", results)
+
+        raw_tokens = [str(FilteredRefreshToken.for_user(user)) for _ in range(BATCH_SIZE)]
+
+        def verify_serializer(tokens):
+            for token in tokens:
+                TokenVerifySerializer(data={"token": token}).is_valid(raise_exception=True)
+
+        report(
+            f"Verifying a token ({BLACKLISTED} blacklisted)",
+            {
+                "TokenVerifySerializer": measure(lambda: verify_serializer(raw_tokens[:1]), iterations),
+                "verify_tokens": measure(lambda: verify_tokens(raw_tokens[:1]), iterations),
+            },
+        )
+        report(
+            f"Verifying a batch of {BATCH_SIZE} tokens ({BLACKLISTED} blacklisted)",
+            {
+                "TokenVerifySerializer": measure(lambda: verify_serializer(raw_tokens), iterations // 20, warmup=5),
+                "verify_tokens": measure(lambda: verify_tokens(raw_tokens), iterations // 20, warmup=5),
+            },
+        )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
 
 class AbstractMiddleware(ABC):
     """
@@ -7,8 +9,22 @@ class AbstractMiddleware(ABC):
     process_* hook behavior without using MiddlewareMixin.
 
     You can subclass this to implement only the hooks you need.
+
+    `process_request` and `process_response` run around the rest of the chain. Like for any
+    middleware, Django's handler calls `process_view`, `process_exception` and
+    `process_template_response` itself when a subclass defines them, so they have no default
+    here: defining one registers the middleware for every request, through a thread hop
+    under ASGI unless the hook is `async def`.
+
+    The middleware is both sync and async capable. Under ASGI (when the next middleware
+    is async) requests go through `__acall__` without a thread hop: `process_request` and
+    `process_response` are awaited when defined with `async def`, run through `sync_to_async`
+    when overridden as sync methods, and skipped otherwise.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         """
         Called once when the server starts.
@@ -16,6 +32,10 @@ class AbstractMiddleware(ABC):
         `get_response` is the next middleware or the Django view.
         """
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            # Tells Django's handler to await the middleware instead of wrapping it in async_to_sync
+            markcoroutinefunction(self)
         super().__init__()
 
     # -----------------------------
@@ -33,32 +53,6 @@ class AbstractMiddleware(ABC):
         """
         return None
 
-    def process_view(self, request, view_func, view_args, view_kwargs):
-        """
-        Runs RIGHT BEFORE the view is executed.
-        Good for:
-        - Inspecting/modifying view arguments
-        - Cancelling execution by returning a response
-        """
-        return None
-
-    def process_exception(self, request, exception):
-        """
-        Runs ONLY if the view raises an exception.
-        Good for:
-        - Logging
-        - Returning a custom error response
-        """
-        return None
-
-    def process_template_response(self, request, response):
-        """
-        Runs ONLY for TemplateResponse objects.
-        Good for:
-        - Modifying template context before rendering
-        """
-        return response
-
     def process_response(self, request, response):
         """
         Runs for ALL responses.
@@ -78,42 +72,49 @@ class AbstractMiddleware(ABC):
         The core entry point for the middleware.
         Manually triggers process_* hooks in the correct order.
         """
+        if self.async_mode:
+            return self.__acall__(request)
 
         # 1. process_request
         result = self.process_request(request)
         if result:
             return self.process_response(request, result)
 
-        # 2. process_view — but Django normally calls this *before* the view,
-        #    not here. We emulate it inside a wrapper.
-        response = None
-
-        def wrapped_view(*view_args, **view_kwargs):
-            nonlocal response
-            result = self.process_view(request, view, view_args, view_kwargs)
-            if result:
-                response = result
-                return result
-            return view(*view_args, **view_kwargs)
-
-        # Trick: replace the view temporarily
-        view = self.get_response
-
-        try:
-            # Execute the view
-            if response is None:
-                response = wrapped_view(request)
-        except Exception as exc:
-            # 3. process_exception
-            exception_result = self.process_exception(request, exc)
-            if exception_result:
-                response = exception_result
-            else:
-                raise  # no handler → Django handles it
-
-        # 4. process_template_response
-        if hasattr(response, "render"):
-            response = self.process_template_response(request, response)
-
-        # 5. process_response
+        # 2. The rest of the chain, Django calls the view, exception and template response hooks
+        response = self.get_response(request)
+
+        # 3. process_response
         return self.process_response(request, response)
+
+    # --------------------------------------
+    # ASYNC EXECUTION FLOW (same hook order)
+    # --------------------------------------
+
+    async def __acall__(self, request):
+        """
+        Async entry point, used when the middleware chain runs under ASGI.
+        """
+
+        # 1. process_request
+        result = await self._run_hook("process_request", request)
+        if result:
+            return await self._run_hook("process_response", request, result, default=result)
+
+        # 2. The rest of the chain
+        response = await self.get_response(request)
+
+        # 3. process_response
+        return await self._run_hook("process_response", request, response, default=response)
+
+    async def _run_hook(self, name, *args, default=None):
+        """
+        Run a process_* hook from the async flow.
+
+        Hooks that aren't overridden return `default` without being called at all.
+        """
+        hook = getattr(self, name)
+        if getattr(type(self), name) is getattr(AbstractMiddleware, name):
+            return default
+        if iscoroutinefunction(hook):
+            return await hook(*args)
+        return await sync_to_async(hook, thread_sensitive=True)(*args)
@@ -33,6 +33,7 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
 ]
 
@@ -44,14 +45,23 @@ LOCAL_APPS = [
 INSTALLED_APPS = UNFOLD_APPS + DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "core.middlewares.context.RequestContextMiddleware",
+    "core.middlewares.query_budget.QueryBudgetMiddleware",
+    "core.middlewares.metrics.MetricsMiddleware",
+    "core.middlewares.profiling.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "core.middlewares.dispatch.PathDispatchMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+# Only run for paths outside of CORS_URLS_REGEX (the admin), see PathDispatchMiddleware
+ADMIN_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -74,14 +84,36 @@ TEMPLATES = [
 ASGI_APPLICATION = "config.server.asgi.application"
 WSGI_APPLICATION = "config.server.wsgi.application"
 
+# Pooled connections (psycopg 3) are shared by the threads of a process, unlike persistent
+# connections which are per thread and never reused by requests served through sync_to_async
+DB_POOL_ENABLED = config("DB_POOL_ENABLED", default=False, cast=bool)
+
 DATABASES = {
     "default": dj_database_url.parse(
         url=DATABASE_URL,
-        conn_max_age=600,
-        conn_health_checks=True,
+        # Pooled connections go back to the pool at the end of the request instead
+        conn_max_age=0 if DB_POOL_ENABLED else 600,
+        conn_health_checks=not DB_POOL_ENABLED,
     )
 }
 
+if DB_POOL_ENABLED:
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        # Seconds a request waits for a free connection before failing
+        "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+        # Seconds before idle connections above min_size are closed
+        "max_idle": config("DB_POOL_MAX_IDLE", default=300, cast=float),
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -112,6 +144,41 @@ MEDIA_ROOT = BASE_DIR.parent / "cdn/media"
 TELEGRAM_BOT_TOKEN = config("TELEGRAM_BOT_TOKEN", default="")
 TELEGRAM_CHAT_ID = config("TELEGRAM_CHAT_ID", default="")
 
+# Records queued for the logging listener thread before new ones are dropped
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10_000, cast=int)
+
+# Queries slower than this are logged and aggregated (0 disables), see core.utils.slow_queries
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=200, cast=float)
+# Fraction of the slow SELECTs logged with their EXPLAIN
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = config("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", default=0.1, cast=float)
+
+# Per-request query counting, see core.middlewares.query_budget.QueryBudgetMiddleware
+QUERY_BUDGET_SAMPLE_RATE = config("QUERY_BUDGET_SAMPLE_RATE", default=0.05, cast=float)
+# Raise QueryBudgetExceeded instead of logging (and measure every request), meant for tests
+QUERY_BUDGET_STRICT = config("QUERY_BUDGET_STRICT", default=False, cast=bool)
+QUERY_BUDGET_HEADERS = config("QUERY_BUDGET_HEADERS", default=DEBUG, cast=bool)
+# Executions of the same query in a request reported as a possible N+1
+QUERY_BUDGET_REPEATED_THRESHOLD = config("QUERY_BUDGET_REPEATED_THRESHOLD", default=5, cast=int)
+
+# Request metrics served on /api/v1/metrics/, see core.utils.metrics
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+# Every worker process writes its metrics there, emptied by scripts/entrypoint.sh on start
+METRICS_DIR = config("METRICS_DIR", default="") or str(BASE_DIR.parent / "logs" / "metrics")
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5, cast=float)
+# Bearer token required to read the metrics, the endpoint is only open without one with DEBUG
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Profiled requests, see core.middlewares.profiling.ProfilingMiddleware
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_INTERVAL_MS = config("PROFILING_INTERVAL_MS", default=5, cast=float)
+# Seconds an X-Profile header made by `manage.py dump_profiles --sign` stays valid
+PROFILING_SIGNATURE_MAX_AGE = config("PROFILING_SIGNATURE_MAX_AGE", default=3600, cast=int)
+
+# Readiness checks, see core.utils.health
+HEALTH_CACHE_TTL = config("HEALTH_CACHE_TTL", default=5, cast=float)
+HEALTH_CHECK_TIMEOUT = config("HEALTH_CHECK_TIMEOUT", default=2, cast=float)
+HEALTH_MIN_FREE_DISK_MB = config("HEALTH_MIN_FREE_DISK_MB", default=500, cast=int)
+
 # Ensure logs directory exists
 if not os.path.exists(BASE_DIR.parent / "logs"):
     os.makedirs(BASE_DIR.parent / "logs")
@@ -204,32 +271,56 @@ LOGGING = {
             "class": "core.utils.logging.TelegramErrorHandler",
             "bot_token": TELEGRAM_BOT_TOKEN,
             "chat_id": TELEGRAM_CHAT_ID,
-            "filters": ["request_context"],
             "formatter": "telegram",
         },
+        # Queue handlers: the logging thread only enqueues records, the handlers above
+        # run on a single listener thread per process (see core.utils.logging)
+        "queue_app": {
+            "class": "core.utils.logging.NonBlockingQueueHandler",
+            "queue": {"()": "core.utils.logging.get_log_queue", "maxsize": LOG_QUEUE_SIZE},
+            "listener": "core.utils.logging.RoutedQueueListener",
+            "handlers": ["app_file", "console"],
+            "respect_handler_level": True,
+        },
+        "queue_errors": {
+            "class": "core.utils.logging.NonBlockingQueueHandler",
+            "queue": {"()": "core.utils.logging.get_log_queue", "maxsize": LOG_QUEUE_SIZE},
+            "listener": "core.utils.logging.RoutedQueueListener",
+            "handlers": ["telegram_errors", "error_file"],
+            "respect_handler_level": True,
+            # Reads the request in the logging thread, the traceback is formatted lazily
+            "filters": ["request_context"],
+        },
+        "queue_slow_queries": {
+            "class": "core.utils.logging.NonBlockingQueueHandler",
+            "queue": {"()": "core.utils.logging.get_log_queue", "maxsize": LOG_QUEUE_SIZE},
+            "listener": "core.utils.logging.RoutedQueueListener",
+            "handlers": ["slow_queries_file"],
+            "respect_handler_level": True,
+        },
     },
     "loggers": {
         # Django internal logs
         "django": {
-            "handlers": ["app_file", "console"],
+            "handlers": ["queue_app"],
             "level": "INFO",
             "propagate": False,
         },
         # Django request errors → TELEGRAM!
         "django.request": {
-            "handlers": ["telegram_errors", "error_file"],
+            "handlers": ["queue_errors"],
             "level": "ERROR",
             "propagate": False,
         },
         # Slow queries
-        "django.db.backends": {
-            "handlers": ["slow_queries_file"],
+        "core.utils.slow_queries": {
+            "handlers": ["queue_slow_queries"],
             "level": "WARNING",
             "propagate": False,
         },
         # Universal logger (entire project)
         "": {
-            "handlers": ["app_file", "console"],
+            "handlers": ["queue_app"],
             "level": "INFO",
         },
     },
@@ -238,15 +329,49 @@ LOGGING = {
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ["rest_framework_simplejwt.authentication.JWTAuthentication"],
+    "DEFAULT_AUTHENTICATION_CLASSES": ["core.api.authentication.CachedJWTAuthentication"],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    # Encodes with orjson, the output is the same as DRF's JSONRenderer
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PAGINATION_CLASS": "core.utils.pagination.CustomPagination",
     "PAGE_SIZE": 10,
+    # Used by the token bucket throttles, see core.utils.throttling
+    "DEFAULT_THROTTLE_RATES": {
+        "login": config("LOGIN_THROTTLE_RATE", default="10/min"),
+    },
+    # Client IPs are only read from X-Forwarded-For behind that many trusted proxies,
+    # otherwise a spoofed header would get every request a fresh throttle bucket
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
     "EXCEPTION_HANDLER": "core.api.exceptions.custom_exception_handler",  # noqa
 }
 
+# Rotated refresh tokens are blacklisted, see core.api.tokens.FilteredRefreshToken
+SIMPLE_JWT = {
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "AUTH_HEADER_TYPES": ("Bearer",),
+}
+
 AUTH_USER_MODEL = "account.User"  # noqa
 
+AUTHENTICATION_BACKENDS = ["core.backends.OffloadedModelBackend"]
+
+# Password hashing runs in a process pool, see core.utils.hashing.HashingExecutor
+PASSWORD_HASHING_WORKERS = config("PASSWORD_HASHING_WORKERS", default=2, cast=int)
+PASSWORD_HASHING_MAX_PENDING = config("PASSWORD_HASHING_MAX_PENDING", default=32, cast=int)
+
+SILENCED_SYSTEM_CHECKS = [
+    # User.username is unique among live (not soft-deleted) users through a partial unique constraint
+    "auth.E003",
+    # The admin's session, auth and messages middlewares are in ADMIN_MIDDLEWARE
+    "admin.E408",
+    "admin.E409",
+    "admin.E410",
+]
+
 UNFOLD = {
     "SITE_URL": "/admin/",
     "SITE_TITLE": "DJANGO REST Template",
@@ -18,11 +18,9 @@ if DEBUG:
     INTERNAL_IPS = ["127.0.0.1"]
 
     SIMPLE_JWT = {
+        **SIMPLE_JWT,
         "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
         "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
-        "ROTATE_REFRESH_TOKENS": True,
-        "BLACKLIST_AFTER_ROTATION": True,
-        "AUTH_HEADER_TYPES": ("Bearer",),
     }
 
     CORS_ALLOW_ALL_ORIGINS = True
@@ -4,9 +4,7 @@ from .base import *
 DEBUG = False
 
 SIMPLE_JWT = {
+    **SIMPLE_JWT,
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=6),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
-    "ROTATE_REFRESH_TOKENS": True,
-    "BLACKLIST_AFTER_ROTATION": True,
-    "AUTH_HEADER_TYPES": ("Bearer",),
 }
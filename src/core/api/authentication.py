@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.api.tokens import USER_VERSION_CLAIM
+from core.utils.user_cache import get_cached_user, is_cache_shared, local_user_cache, user_cache_key
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user without a database query.
+
+    Users are looked up by id and the "ver" claim of the token, first in a per-process LRU
+    (see `LocalUserCache`), then in the shared cache. The version changes whenever the user
+    is saved or deleted, so deactivated or deleted users are never served from the cache
+    to tokens issued after the change. Tokens without the claim or with a stale version
+    fall back to the regular database lookup, and so does every token when the default cache
+    is per-process (see `is_cache_shared`), as version changes wouldn't reach the other workers.
+    """
+
+    cache_timeout = 300
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        version = validated_token.get(USER_VERSION_CLAIM)
+        if version is None or api_settings.CHECK_REVOKE_TOKEN or not is_cache_shared():
+            return super().get_user(validated_token)
+
+        user = local_user_cache.get(user_id, version)
+        if user is not None:
+            return user
+
+        is_current, user = get_cached_user(user_id, version)
+        if not is_current:
+            # Stale version, the user changed after the token was issued
+            return super().get_user(validated_token)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(user_cache_key(user_id, version), user, self.cache_timeout)
+
+        local_user_cache.set(user_id, version, user)
+        return user
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.utils.bloom import BloomFilter
+from core.utils.user_cache import is_cache_shared
+
+_GENERATION_KEY = "auth:blacklist:generation"
+
+
+def bump_blacklist_generation() -> Optional[int]:
+    """
+    Tell every process that a token was blacklisted, so their filters sync before the next check.
+
+    Returns the new generation, or None when the generation had to be reset.
+    """
+    try:
+        return cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.add(_GENERATION_KEY, time.time_ns(), None)
+        return None
+
+
+class BlacklistFilter:
+    """
+    Per-process Bloom filter of the ids (jti) of blacklisted refresh tokens.
+
+    A negative answer means "definitely not blacklisted" and needs no query, only positive
+    answers are confirmed against the `BlacklistedToken` table. The filter is built from the
+    unexpired blacklisted tokens and kept up to date incrementally, by reading the rows whose
+    id is above the last one seen. An incremental sync runs whenever another process bumped the
+    shared blacklist generation (see `bump_blacklist_generation`) and at least every
+    `sync_interval` seconds. The filter is skipped when the cache isn't shared between processes.
+    The filter is rebuilt from scratch every `rebuild_interval` seconds, dropping expired tokens,
+    or earlier when it outgrows its capacity.
+    """
+
+    sync_interval = 30
+    rebuild_interval = 3600
+    min_capacity = 10_000
+    error_rate = 0.001
+    # Ids are assigned before commit, re-read a few rows below the last one seen
+    # so rows committed out of order are not missed
+    sync_overlap = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._pid = None
+        self._last_id = 0
+        self._generation = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def might_contain(self, jti: str) -> bool:
+        self._sync()
+        return self._bloom.might_contain(jti)
+
+    def add(self, jti: str) -> None:
+        """Add a token blacklisted by this process, without waiting for the next sync."""
+        with self._lock:
+            if self._bloom is not None and self._pid == os.getpid():
+                self._bloom.add(jti)
+
+    def on_generation_bumped(self, generation: Optional[int]) -> None:
+        """
+        Record a generation bumped by this process, whose tokens are already in the filter.
+
+        Without it, every token blacklisted by a process would make its next check sync.
+        When another process bumped the generation too, the next check still syncs.
+        """
+        with self._lock:
+            if generation is not None and self._generation is not None and generation == self._generation + 1:
+                self._generation = generation
+
+    def get_blacklisted(self, jtis: Iterable[str]) -> Set[str]:
+        """
+        Return the blacklisted ones among the given token ids, querying only the filter's candidates.
+
+        With a per-process cache (see `is_cache_shared`), generation bumps never reach the other
+        processes, whose filters would miss their blacklisted tokens until the next periodic sync:
+        every token is looked up in the table then.
+        """
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        if is_cache_shared():
+            # A single sync (and generation read) for the whole batch
+            self._sync()
+            bloom = self._bloom
+            candidates = [jti for jti in jtis if jti and bloom.might_contain(jti)]
+        else:
+            candidates = [jti for jti in jtis if jti]
+        if not candidates:
+            return set()
+        return set(BlacklistedToken.objects.filter(token__jti__in=candidates).values_list("token__jti", flat=True))
+
+    def is_blacklisted(self, jti: str) -> bool:
+        return bool(self.get_blacklisted([jti]))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            bloom = self._bloom
+            return {
+                "items": len(bloom) if bloom else 0,
+                "capacity": bloom.capacity if bloom else 0,
+                "size_bytes": len(bloom.bits) if bloom else 0,
+                "last_id": self._last_id,
+            }
+
+    def _sync(self) -> None:
+        generation = cache.get(_GENERATION_KEY)
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._bloom is None
+                or self._pid != os.getpid()
+                or now - self._built_at >= self.rebuild_interval
+                or len(self._bloom) > self._bloom.capacity
+            ):
+                self._rebuild(generation, now)
+            elif generation != self._generation or now - self._synced_at >= self.sync_interval:
+                self._update(generation, now)
+
+    def _rebuild(self, generation, now: float) -> None:
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        last_id = BlacklistedToken.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        rows = BlacklistedToken.objects.filter(id__lte=last_id, token__expires_at__gt=timezone.now())
+        bloom = BloomFilter(max(rows.count() * 2, self.min_capacity), self.error_rate)
+        for jti in rows.values_list("token__jti", flat=True).iterator(chunk_size=10_000):
+            bloom.add(jti)
+
+        self._bloom = bloom
+        self._pid = os.getpid()
+        self._last_id = last_id
+        self._generation = generation
+        self._synced_at = self._built_at = now
+
+    def _update(self, generation, now: float) -> None:
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        rows = BlacklistedToken.objects.filter(id__gt=self._last_id - self.sync_overlap).order_by("id")
+        for row_id, jti in rows.values_list("id", "token__jti"):
+            # Tokens blacklisted by this process are already in the filter
+            if not self._bloom.might_contain(jti):
+                self._bloom.add(jti)
+            self._last_id = max(self._last_id, row_id)
+
+        self._generation = generation
+        self._synced_at = now
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def on_token_blacklisted(jti: str) -> None:
+    """Record a token blacklisted by this process, and notify the other processes once committed."""
+    blacklist_filter.add(jti)
+    transaction.on_commit(lambda: blacklist_filter.on_generation_bumped(bump_blacklist_generation()))
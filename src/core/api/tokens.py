@@ -0,0 +1,133 @@
+import hashlib
+import time
+from typing import Iterable, List, Optional, Sequence, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from core.api.blacklist import blacklist_filter, on_token_blacklisted
+from core.utils.user_cache import get_user_version
+
+USER_VERSION_CLAIM = "ver"
+
+
+class VersionedRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user version claim used by `CachedJWTAuthentication`.
+
+    Access tokens created from it always get the current version of the user,
+    so refreshing a token issued before the user changed makes it cacheable again.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USER_VERSION_CLAIM] = get_user_version(user.pk)
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            access[USER_VERSION_CLAIM] = get_user_version(user_id)
+        return access
+
+
+class FilteredRefreshToken(VersionedRefreshToken):
+    """
+    Refresh token checked against the in-memory blacklist filter instead of querying on every refresh.
+
+    Only tokens the filter can't rule out are looked up in the `BlacklistedToken` table.
+    Blacklisting a token that already is (a replay racing with its first refresh) fails
+    with a `TokenError`, so a rotated token never yields two refreshes.
+    """
+
+    def check_blacklist(self) -> None:
+        if blacklist_filter.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        jti = self.payload[api_settings.JTI_CLAIM]
+        outstanding = OutstandingToken.objects.filter(jti=jti).only("id").first()
+        if outstanding is None:
+            # Tokens issued before the blacklist app was installed
+            result = super().blacklist()
+        else:
+            result = BlacklistedToken.objects.get_or_create(token=outstanding)
+        if not result[1]:
+            raise TokenError(_("Token is blacklisted"))
+        on_token_blacklisted(jti)
+        return result
+
+
+def blacklist_enabled() -> bool:
+    return (
+        api_settings.BLACKLIST_AFTER_ROTATION
+        and "rest_framework_simplejwt.token_blacklist" in settings.INSTALLED_APPS
+    )
+
+
+def get_blacklisted_jtis(jtis: Iterable[str]) -> Set[str]:
+    """Return the blacklisted ones among the given token ids, see `BlacklistFilter`."""
+    if not blacklist_enabled():
+        return set()
+    return blacklist_filter.get_blacklisted(jtis)
+
+
+def _verified_cache_key(raw_token: str) -> str:
+    return "auth:verified:" + hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def verify_tokens(raw_tokens: Sequence[str]) -> List[Optional[str]]:
+    """
+    Verify the tokens, returning None for every valid token and the error message otherwise.
+
+    The blacklist is checked first from the unverified token ids, so blacklisted tokens
+    never reach the signature check and cached results never outlive a blacklisting.
+    Successful verifications are cached by token digest until the token expires, so a
+    token is only verified cryptographically once. The whole batch takes at most one
+    blacklist query and two cache round trips, the blacklist generation and the verified
+    tokens (plus a cache write per newly verified token), whatever its size.
+    """
+    errors: List[Optional[str]] = [None] * len(raw_tokens)
+
+    jtis = {}
+    for i, raw_token in enumerate(raw_tokens):
+        try:
+            payload = token_backend.decode(raw_token, verify=False)
+        except TokenBackendError:
+            errors[i] = _("Token is invalid")
+            continue
+        jtis[i] = payload.get(api_settings.JTI_CLAIM)
+
+    blacklisted = get_blacklisted_jtis(jtis.values())
+    pending = {}
+    for i, jti in jtis.items():
+        if jti in blacklisted:
+            errors[i] = _("Token is blacklisted")
+        else:
+            pending[i] = _verified_cache_key(raw_tokens[i])
+
+    verified = cache.get_many(pending.values())
+    now = time.time()
+    for i, key in pending.items():
+        if key in verified:
+            continue
+        try:
+            token = UntypedToken(raw_tokens[i])
+        except TokenError as e:
+            errors[i] = e.args[0]
+            continue
+        timeout = int(token.get("exp", now) - now)
+        if timeout > 0:
+            cache.set(key, True, timeout)
+
+    return errors
@@ -1,27 +1,149 @@
+import csv
+import io
+import json
+from typing import Optional, Sequence
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from rest_framework import generics, mixins, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
 from logging import getLogger
 
+from core.api.serializers import get_values_serializer
 from core.utils.pagination import CustomPagination
 
 logger = getLogger(__name__)
 
 
 class PaginatedListMixin:
+    """
+    Mixin that lists the filtered queryset page by page.
+
+    Set `values_fields` to serve the list in the read-only "compiled" mode: rows are fetched
+    with `.values(*values_fields)` and turned into primitives by a cached `ValuesSerializer`,
+    skipping model instantiation and the per-field dispatch of the DRF serializer.
+    """
 
     pagination_class = CustomPagination
+    values_fields: Optional[Sequence[str]] = None
 
-    def list(self, request, *args, **kwargs):
+    def get_list_queryset(self):
         qs = self.filter_queryset(self.get_queryset())  # noqa
-        if qs:
-            result = self.paginated_queryset(qs, request)  # noqa
-            serializer = self.get_serializer(result, many=True)  # noqa
-            response = self.paginated_response(data=serializer.data)  # noqa
-            return Response(response)
-        return Response({"success": True, "message": "OK", "results": []})
+        if self.values_fields is not None:
+            qs = qs.values(*self.values_fields)
+        return qs
+
+    def get_list_data(self, rows):
+        """Return the serialized representation of a batch of rows of `get_list_queryset()`."""
+        if self.values_fields is not None:
+            serializer = get_values_serializer(self.get_queryset().model, tuple(self.values_fields))  # noqa
+            return serializer.to_representation(rows)
+        return self.get_serializer(rows, many=True).data  # noqa
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the filtered queryset without ever materializing it as a whole.
+
+        Only the page query (plus the count query of the paginator, if any) runs,
+        and an empty result is detected from the page itself.
+        """
+        qs = self.get_list_queryset()
+        page = self.paginate_queryset(qs)  # noqa
+        if page is None:
+            # Pagination is disabled for the view
+            return Response({"success": True, "message": "OK", "results": self.get_list_data(qs)})
+        if not page:
+            # Still reports the total count and the page metadata
+            return self.get_paginated_response([])  # noqa
+        return self.get_paginated_response(self.get_list_data(page))  # noqa
+
+
+class StreamingExportMixin:
+    """
+    Mixin that streams the whole filtered queryset as NDJSON or CSV instead of a paginated page.
+
+    Enabled with the `export` query parameter (`?export=ndjson` or `?export=csv`).
+    Rows are read through a server-side cursor (`.iterator(chunk_size=...)`) and serialized
+    `export_chunk_size` rows at a time, so memory stays flat no matter how large the result is.
+    Under ASGI the rows are pulled through an async iterator on the thread the view ran on,
+    so Django does not buffer the whole stream before sending it.
+    """
+
+    export_query_param = "export"
+    export_chunk_size = 2000
+    export_content_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get(self.export_query_param)
+        if export_format is None:
+            return super().list(request, *args, **kwargs)  # noqa
+
+        if export_format not in self.export_content_types:
+            raise ValidationError(
+                {self.export_query_param: [_("Unsupported export format: %s") % export_format]}
+            )
+
+        qs = self.get_list_queryset()  # noqa
+        chunks = getattr(self, f"iter_{export_format}")(self.iter_export_batches(qs))
+        if isinstance(request._request, ASGIRequest):
+            chunks = self._as_async_iterator(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type=self.export_content_types[export_format])
+        filename = f"{qs.model._meta.model_name}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def iter_export_batches(self, qs):
+        """Yield the serialized rows of the queryset in batches of `export_chunk_size`."""
+        batch = []
+        for obj in qs.iterator(chunk_size=self.export_chunk_size):
+            batch.append(obj)
+            if len(batch) >= self.export_chunk_size:
+                yield self.get_list_data(batch)  # noqa
+                batch = []
+        if batch:
+            yield self.get_list_data(batch)  # noqa
+
+    def iter_ndjson(self, batches):
+        for rows in batches:
+            yield "".join(json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n" for row in rows)
+
+    def iter_csv(self, batches):
+        buffer = io.StringIO()
+        writer = None
+        for rows in batches:
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    @staticmethod
+    def _as_async_iterator(iterator):
+        """Wrap a sync iterator so that every chunk is pulled on the thread the view ran on."""
+        next_chunk = sync_to_async(next, thread_sensitive=True)
+
+        async def stream():
+            while True:
+                chunk = await next_chunk(iterator, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        return stream()
 
 
 class CustomResponseMixin:
@@ -52,7 +174,8 @@ class CustomResponseMixin:
     def finalize_response(self, request, response, *args, **kwargs):
         response = super().finalize_response(request, response, *args, **kwargs)  # noqa
 
-        if self._is_structured_response(response):
+        # Plain Django responses (e.g. streamed exports) have no data to wrap
+        if not isinstance(response, Response) or self._is_structured_response(response):
             return response
 
         if response.status_code < 400:
@@ -89,7 +212,8 @@ class CustomResponseMixin:
 
 
 class BaseAPIView(CustomResponseMixin, generics.GenericAPIView):
-    ...
+    # Maximum number of queries per request, enforced by QueryBudgetMiddleware on sampled requests
+    query_budget: Optional[int] = None
 
     def _parse_error_message(self, errors):
         message = None
@@ -121,7 +245,7 @@ class BaseAPIView(CustomResponseMixin, generics.GenericAPIView):
         return {"errors": _errors, "message": message}
 
 
-class ListAPIView(mixins.ListModelMixin, PaginatedListMixin, BaseAPIView):
+class ListAPIView(StreamingExportMixin, PaginatedListMixin, mixins.ListModelMixin, BaseAPIView):
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -155,3 +279,158 @@ class DestroyAPIView(mixins.DestroyModelMixin, BaseAPIView):
         instance = self.get_object()
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncAPIViewMixin:
+    """
+    Mixin that runs a DRF view natively under ASGI.
+
+    `dispatch` is a coroutine, so Django awaits the view on the event loop instead of
+    running the whole request in a thread. DRF's authentication, permission and throttle
+    checks (`initial`) can hit the database and still run in a single `sync_to_async` hop.
+    Handlers are `async def` and use the async ORM.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)  # noqa
+        self.request = request
+        self.headers = self.default_response_headers  # noqa
+
+        try:
+            await sync_to_async(self.initial, thread_sensitive=True)(request, *args, **kwargs)  # noqa
+
+            if request.method.lower() in self.http_method_names:  # noqa
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)  # noqa
+            else:
+                handler = self.http_method_not_allowed  # noqa
+
+            response = handler(request, *args, **kwargs)
+            if iscoroutinefunction(handler):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)  # noqa
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)  # noqa
+        return self.response
+
+    async def aget_object(self):
+        """Async counterpart of `GenericAPIView.get_object`."""
+        queryset = self.filter_queryset(self.get_queryset())  # noqa
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field  # noqa
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}  # noqa
+
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions, thread_sensitive=True)(self.request, obj)  # noqa
+        return obj
+
+    async def aget_serializer_data(self, *args, **kwargs):
+        """Serialize in a thread, as serializer fields may access related objects lazily."""
+
+        def get_data():
+            return self.get_serializer(*args, **kwargs).data  # noqa
+
+        return await sync_to_async(get_data, thread_sensitive=True)()
+
+
+class AsyncListAPIView(AsyncAPIViewMixin, ListAPIView):
+    """
+    Async ListAPIView. The count and the page are fetched with the async ORM.
+
+    With `values_fields` set, rows are converted on the event loop as well,
+    otherwise the page is serialized in a thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        if request.query_params.get(self.export_query_param) is not None:
+            # Streamed exports read their rows lazily, building the response doesn't query
+            return self.list(request, *args, **kwargs)
+
+        qs = self.get_list_queryset()
+        if self.paginator is None:
+            rows = [row async for row in qs]
+            return Response({"success": True, "message": "OK", "results": await self.aget_list_data(rows)})
+
+        if hasattr(self.paginator, "apaginate_queryset"):
+            page = await self.paginator.apaginate_queryset(qs, request, view=self)
+        else:
+            page = await sync_to_async(self.paginate_queryset, thread_sensitive=True)(qs)
+        if not page:
+            return self.get_paginated_response([])
+        return self.get_paginated_response(await self.aget_list_data(page))
+
+    async def aget_list_data(self, rows):
+        if self.values_fields is not None:
+            return self.get_list_data(rows)
+        return await self.aget_serializer_data(rows, many=True)
+
+
+class AsyncRetrieveAPIView(AsyncAPIViewMixin, RetrieveAPIView):
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aget_serializer_data(instance))
+
+
+class AsyncCreateAPIView(AsyncAPIViewMixin, CreateAPIView):
+    """
+    Async CreateAPIView.
+
+    Serializer validation (e.g. unique validators) and `save()` go through the sync ORM,
+    so they run together in a single thread hop.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(self.create, thread_sensitive=True)(request, *args, **kwargs)
+
+
+class AsyncUpdateAPIView(AsyncAPIViewMixin, UpdateAPIView):
+    """
+    Async UpdateAPIView. The instance is fetched with the async ORM,
+    validation and `save()` run together in a single thread hop.
+    """
+
+    async def put(self, request, *args, **kwargs):
+        return await self.aupdate(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.aupdate(request, *args, partial=True, **kwargs)
+
+    async def aupdate(self, request, *args, partial=False, **kwargs):
+        instance = await self.aget_object()
+
+        def update():
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+            if getattr(instance, "_prefetched_objects_cache", None):
+                instance._prefetched_objects_cache = {}
+            return serializer.data
+
+        return Response(await sync_to_async(update, thread_sensitive=True)())
+
+
+class AsyncDestroyAPIView(AsyncAPIViewMixin, DestroyAPIView):
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.adestroy(request, *args, **kwargs)
+
+    async def adestroy(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        await self.aperform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def aperform_destroy(self, instance):
+        await instance.adelete()
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+
+        from core.utils import query_budget, slow_queries
+        from core.utils.pagination import invalidate_cached_counts
+
+        post_save.connect(invalidate_cached_counts, dispatch_uid="core.pagination.invalidate_cached_counts")
+        post_delete.connect(invalidate_cached_counts, dispatch_uid="core.pagination.invalidate_cached_counts")
+        connection_created.connect(slow_queries.install, dispatch_uid="core.slow_queries.install")
+        connection_created.connect(query_budget.install, dispatch_uid="core.query_budget.install")
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from rest_framework.request import Request
+
+from core.utils.hashing import HashingSaturated, hash_password, verify_password
+
+UserModel = get_user_model()
+
+
+class OffloadedModelBackend(ModelBackend):
+    """
+    ModelBackend whose password checks run on the hashing executor.
+
+    A login never queues behind a saturated executor: it fails fast with `HashingSaturated`
+    (429) instead. Outside of DRF (admin login, plain `authenticate()` calls), nothing renders
+    it as a 429, so the login is denied with `PermissionDenied` instead, which `authenticate()`
+    turns into a failed login. Outdated hashes are upgraded to the preferred hasher on a
+    successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        try:
+            return self._authenticate(username, password, **kwargs)
+        except HashingSaturated:
+            if isinstance(request, Request):
+                raise
+            raise PermissionDenied
+
+    def _authenticate(self, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            hash_password(password, blocking=False)
+        else:
+
+            def setter(raw_password):
+                user.set_password(raw_password)
+                user._password = None
+                user.save(update_fields=["password"])
+
+            if verify_password(password, user.password, setter, blocking=False) and self.user_can_authenticate(user):
+                return user
@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in batches. "
+        "Meant to run periodically (e.g. from cron), unlike flushexpiredtokens it never holds "
+        "locks on the whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows deleted per transaction")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to wait between batches")
+
+    def handle(self, *args, **options):
+        if "rest_framework_simplejwt.token_blacklist" not in settings.INSTALLED_APPS:
+            raise CommandError("rest_framework_simplejwt.token_blacklist is not installed")
+
+        from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).order_by("id")
+        total = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            # Blacklist rows are removed by the cascade with a single DELETE
+            _, deleted = OutstandingToken.objects.filter(id__in=ids).delete()
+            total += sum(deleted.values())
+            self.stdout.write(f"Deleted {sum(deleted.values())} row(s)")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired token row(s)"))
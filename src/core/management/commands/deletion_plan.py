@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+from django.db.models.deletion import CASCADE, DO_NOTHING
+
+from core.utils.deletion import RelationPlan, get_deletion_plan, is_soft_deletable, iter_deletion_plan
+
+
+class Command(BaseCommand):
+    help = "Print the cached soft-delete plan of a model and the number of queries it is expected to run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", type=str, help="Model label, e.g. account.User")
+
+    def describe_action(self, relation: RelationPlan) -> str:
+        """Return a readable name of the on_delete action of the relation."""
+        if hasattr(relation.on_delete, "deconstruct"):
+            return "SET(...)"
+        return relation.on_delete.__name__
+
+    def count_queries(self, relation: RelationPlan) -> int:
+        """Return the number of set-based queries issued for the relation."""
+        if relation.on_delete is DO_NOTHING:
+            return 0
+        if relation.on_delete is CASCADE and not relation.soft:
+            return 0
+        return 1
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if not is_soft_deletable(model):
+            raise CommandError(f"{model._meta.label} is not soft deletable")
+
+        self.stdout.write(self.style.SUCCESS(model._meta.label))
+
+        # The root UPDATE
+        queries = 1
+        for depth, relation in iter_deletion_plan(model):
+            action = self.describe_action(relation)
+            if relation.on_delete is CASCADE:
+                action += " (soft delete)" if relation.soft else " (skipped, not soft deletable)"
+            self.stdout.write(
+                f"{'    ' * depth}{relation.related_model._meta.label}.{relation.field.name} -> {action}"
+            )
+            queries += self.count_queries(relation)
+
+        root_relations = [relation for relation in get_deletion_plan(model) if self.count_queries(relation)]
+        self.stdout.write("")
+        self.stdout.write(f"Set-based cascade (set_based=True): {queries} query(ies), independent of the row count")
+        self.stdout.write(
+            f"Collector cascade: {len(root_relations) + 1} query(ies) "
+            f"plus a full cascade for every soft-deleted child instance"
+        )
@@ -0,0 +1,57 @@
+import re
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from core.utils.profiling import PROFILE_HEADER, merge_profiles, profile_store, sign_profile_header, to_collapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the collapsed stacks of the profiled requests of every process, by view, "
+        "in the format read by flamegraph.pl, speedscope or inferno."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--view", type=str, help="Only dump this view (e.g. url_router:v1:auth:login)")
+        parser.add_argument("--output", type=Path, help="Write one <view>.folded file per view to this directory")
+        parser.add_argument("--reset", action="store_true", help="Delete the recorded profiles afterwards")
+        parser.add_argument(
+            "--sign",
+            action="store_true",
+            help=f"Only print an {PROFILE_HEADER} header value that profiles the requests sending it",
+        )
+
+    def handle(self, *args, **options):
+        if options["sign"]:
+            self.stdout.write(f"{PROFILE_HEADER}: {sign_profile_header()}")
+            return
+
+        profiles = merge_profiles()
+        if options["view"]:
+            if options["view"] not in profiles:
+                raise CommandError(f"No profile recorded for {options['view']}")
+            profiles = {options["view"]: profiles[options["view"]]}
+
+        if not profiles:
+            self.stdout.write("No profiles recorded")
+
+        output = Path(options["output"]) if options["output"] else None
+        for view, (requests, stacks) in sorted(profiles.items()):
+            if output:
+                output.mkdir(parents=True, exist_ok=True)
+                filename = re.sub(r"[^\w.-]", "_", view)
+                path = output / f"{filename}.folded"
+                path.write_text("".join(f"{line}\n" for line in to_collapsed(stacks)))
+                self.stdout.write(
+                    self.style.SUCCESS(f"{view}: {requests} request(s), {sum(stacks.values())} sample(s) -> {path}")
+                )
+            else:
+                # A single flame graph, with a root frame per view
+                for line in to_collapsed(stacks, root=view):
+                    self.stdout.write(line)
+
+        if options["reset"]:
+            for path in profile_store.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self.stderr.write(self.style.SUCCESS("Deleted the recorded profiles"))
@@ -0,0 +1,46 @@
+from django.core.management import BaseCommand, CommandError
+
+from core.utils.slow_queries import merge_snapshots, slow_query_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the slow queries recorded by every process, grouped by fingerprint. "
+        "Percentiles are over the most recent slow executions of each query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Number of queries to print")
+        parser.add_argument(
+            "--sort",
+            choices=["total", "count", "p99", "max"],
+            default="total",
+            help="Order of the queries, by total time by default",
+        )
+        parser.add_argument("--reset", action="store_true", help="Delete the recorded snapshots afterwards")
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit must be positive")
+
+        sort_key = {"total": "total_ms", "count": "count", "p99": "p99_ms", "max": "max_ms"}[options["sort"]]
+        queries = sorted(merge_snapshots().items(), key=lambda item: item[1][sort_key], reverse=True)
+        if not queries:
+            self.stdout.write("No slow queries recorded")
+
+        for fingerprint, aggregate in queries[: options["limit"]]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{fingerprint}  count={aggregate['count']}  p50={aggregate['p50_ms']:.1f}ms  "
+                    f"p99={aggregate['p99_ms']:.1f}ms  max={aggregate['max_ms']:.1f}ms  "
+                    f"total={aggregate['total_ms']:.1f}ms"
+                )
+            )
+            views = sorted(aggregate["views"].items(), key=lambda item: item[1], reverse=True)
+            self.stdout.write("    views: " + ", ".join(f"{view} ({count})" for view, count in views[:5]))
+            self.stdout.write(f"    {aggregate['sql']}")
+
+        if options["reset"]:
+            for path in slow_query_stats.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self.stdout.write(self.style.SUCCESS("Deleted the slow query snapshots"))
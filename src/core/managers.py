@@ -1,11 +1,142 @@
-from django.db.models import Manager
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
-class SoftDeleteManager(Manager):
+from django.apps import apps
+from django.db.models import Manager, QuerySet
+
+from core.utils.deletion import soft_delete_cascade
+from core.utils.pagination import invalidate_cached_counts
+
+
+class SoftDeleteQuerySet(QuerySet):
+    """
+    QuerySet with set-based soft delete, restore and hard delete operations.
+
+    Each operation runs as a single statement (plus the cascade updates of `soft_delete_cascade`).
+    Passing `chunk_size` splits the work into consecutive primary-key ranges of at most
+    `chunk_size` rows, each handled in its own transaction, to keep WAL and lock time bounded
+    on very large purges.
+
+    No per-instance hook runs, so the cached counts of the affected models (see
+    `core.utils.pagination.get_cached_count`) are invalidated here instead.
+    """
+
+    # Set on the querysets of SoftDeleteManager, which never match soft-deleted objects
+    _live_only = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._live_only = self._live_only
+        return clone
+
+    def delete(self) -> Tuple[int, Dict[str, int]]:
+        """Soft delete the matched objects, the same as `SoftDeleteModel.delete()` does."""
+        return self.soft_delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def soft_delete(self, chunk_size: Optional[int] = None) -> Tuple[int, Dict[str, int]]:
+        """
+        Soft delete the matched objects and cascade to their related objects.
+
+        Returns:
+            The total number of soft-deleted rows and the number per model label,
+            in the same shape as `QuerySet.delete()`.
+        """
+        counts: Counter = Counter()
+        for chunk in self._iter_chunks(chunk_size, "soft_delete"):
+            counts.update(soft_delete_cascade(chunk, using=self._db))
+        self._invalidate_counts(counts)
+        return sum(counts.values()), dict(counts)
+
+    soft_delete.alters_data = True
+    soft_delete.queryset_only = True
+
+    def restore(self, chunk_size: Optional[int] = None) -> int:
+        """
+        Restore the matched soft-deleted objects.
+
+        Like `SoftDeleteModel.restore()`, related objects are not restored. Only available on
+        querysets that include soft-deleted objects: `objects.deleted()` or `objects.with_deleted()`.
+
+        Returns:
+            The number of restored rows.
+        """
+        if self._live_only:
+            raise TypeError("Cannot restore live objects, use deleted() or with_deleted() to select deleted ones.")
+
+        restored = 0
+        for chunk in self._iter_chunks(chunk_size, "restore"):
+            restored += chunk.filter(deleted_at__isnull=False).update(deleted_at=None)
+        if restored:
+            self._invalidate_counts([self.model._meta.label])
+        return restored
+
+    restore.alters_data = True
+    restore.queryset_only = True
+
+    def hard_delete(self, chunk_size: Optional[int] = None) -> Tuple[int, Dict[str, int]]:
+        """
+        Permanently delete the matched objects from the database.
+
+        Returns:
+            The same result as `QuerySet.delete()`, summed over all chunks.
+        """
+        counts: Counter = Counter()
+        for chunk in self._iter_chunks(chunk_size, "hard_delete"):
+            counts.update(chunk._hard_delete_chunk())
+        # Rows removed without loading them (fast deletes) send no post_delete
+        self._invalidate_counts(label for label, count in counts.items() if count)
+        return sum(counts.values()), dict(counts)
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+    def _hard_delete_chunk(self) -> Dict[str, int]:
+        """Permanently delete the objects of a single chunk, return the number deleted per model label."""
+        _, deleted = super().delete()
+        return deleted
+
+    @staticmethod
+    def _invalidate_counts(labels: Iterable[str]) -> None:
+        for label in labels:
+            invalidate_cached_counts(apps.get_model(label))
+
+    def _iter_chunks(self, chunk_size: Optional[int], operation: str) -> Iterator[QuerySet]:
+        """
+        Yield the queryset split into consecutive primary-key ranges of at most `chunk_size` rows.
+
+        Only the upper boundary of every range is fetched, so memory stays constant
+        no matter how many rows are matched.
+        """
+        if self.query.is_sliced:
+            raise TypeError(f"Cannot use 'limit' or 'offset' with {operation}().")
+
+        if not chunk_size:
+            yield self
+            return
+
+        queryset = self.order_by("pk")
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            upper_pk = chunk.values_list("pk", flat=True)[chunk_size - 1 : chunk_size].first()
+            if upper_pk is None:
+                yield chunk
+                return
+            yield chunk.filter(pk__lte=upper_pk)
+            last_pk = upper_pk
+
+
+class SoftDeleteManager(Manager.from_queryset(SoftDeleteQuerySet)):
     """Manager that filters out soft-deleted objects by default."""
 
     def get_queryset(self):
         """Return NOT DELETED objects."""
-        return super().get_queryset().filter(deleted_at__isnull=True)
+        queryset = super().get_queryset().filter(deleted_at__isnull=True)
+        queryset._live_only = True
+        return queryset
 
     def deleted(self):
         """Return DELETED objects."""
@@ -13,4 +144,4 @@ class SoftDeleteManager(Manager):
 
     def with_deleted(self):
         """Return ALL objects."""
-        return super().get_queryset()
\ No newline at end of file
+        return super().get_queryset()
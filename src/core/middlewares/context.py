@@ -0,0 +1,25 @@
+from config.middlewares.abstract import AbstractMiddleware
+from core.utils.context import current_request
+
+
+class RequestContextMiddleware(AbstractMiddleware):
+    """
+    Makes the request available to code without access to it (e.g. database instrumentation)
+    through the `core.utils.context.current_request` context variable.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+    async def __acall__(self, request):
+        token = current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_request.reset(token)
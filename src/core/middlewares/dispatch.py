@@ -0,0 +1,105 @@
+import re
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+from config.middlewares.abstract import AbstractMiddleware
+
+
+class PathDispatchMiddleware(AbstractMiddleware):
+    """
+    Runs the `ADMIN_MIDDLEWARE` stack only for requests outside of the API.
+
+    API routes (`CORS_URLS_REGEX`) authenticate with JWT and never use sessions, CSRF
+    cookies, the session user or messages, so they skip those middlewares entirely and
+    go straight to the rest of the `MIDDLEWARE` chain. Every other path (the admin)
+    runs through the full stack, built once at startup the same way Django builds
+    `MIDDLEWARE`, including the view, exception and template response hooks.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.lean_path_regex = re.compile(settings.CORS_URLS_REGEX)
+
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        for middleware_path in reversed(settings.ADMIN_MIDDLEWARE):
+            middleware = import_string(middleware_path)(handler)
+            if hasattr(middleware, "process_view"):
+                self._view_middleware.insert(0, self._adapt(middleware.process_view))
+            if hasattr(middleware, "process_template_response"):
+                self._template_response_middleware.append(self._adapt(middleware.process_template_response))
+            if hasattr(middleware, "process_exception"):
+                # Django always calls exception middlewares synchronously
+                self._exception_middleware.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.admin_handler = handler
+
+        if self.async_mode:
+            # Django awaits coroutine hooks directly, so API requests don't pay for a thread hop
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def _adapt(self, method):
+        if self.async_mode and not iscoroutinefunction(method):
+            return sync_to_async(method, thread_sensitive=True)
+        return method
+
+    def is_lean_path(self, request) -> bool:
+        return self.lean_path_regex.match(request.path_info) is not None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.is_lean_path(request):
+            return self.get_response(request)
+        return self.admin_handler(request)
+
+    async def __acall__(self, request):
+        if self.is_lean_path(request):
+            return await self.get_response(request)
+        return await self.admin_handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean_path(request):
+            return None
+        for method in self._view_middleware:
+            response = method(request, view_func, view_args, view_kwargs)
+            if response:
+                return response
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean_path(request):
+            return None
+        for method in self._view_middleware:
+            response = await method(request, view_func, view_args, view_kwargs)
+            if response:
+                return response
+        return None
+
+    def process_exception(self, request, exception):
+        if self.is_lean_path(request):
+            return None
+        for method in self._exception_middleware:
+            response = method(request, exception)
+            if response:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if not self.is_lean_path(request):
+            for method in self._template_response_middleware:
+                response = method(request, response)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        if not self.is_lean_path(request):
+            for method in self._template_response_middleware:
+                response = await method(request, response)
+        return response
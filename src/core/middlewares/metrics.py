@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from config.middlewares.abstract import AbstractMiddleware
+from core.utils.metrics import UNMATCHED_ROUTE, exporter, metrics_store
+from core.utils.query_budget import QueryStats, current_query_stats
+
+
+class MetricsMiddleware(AbstractMiddleware):
+    """
+    Records the latency, status, response size and database queries of every request
+    in `core.utils.metrics.metrics_store`, by route.
+
+    Queries are counted with the `core.utils.query_budget` execute wrapper: requests sampled
+    by `QueryBudgetMiddleware` (which runs first) reuse its stats, the others get stats that
+    only count. Served on `/api/v1/metrics/`, disabled with `METRICS_ENABLED = False`.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start, stats, token = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.end(token)
+        self.observe(request, response, start, stats)
+        return response
+
+    async def __acall__(self, request):
+        start, stats, token = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.end(token)
+        self.observe(request, response, start, stats)
+        return response
+
+    @staticmethod
+    def begin():
+        exporter.ensure_started()
+        metrics_store.begin()
+        stats = current_query_stats.get()
+        token = None
+        if stats is None:
+            stats = QueryStats(track_statements=False)
+            token = current_query_stats.set(stats)
+        return time.perf_counter(), stats, token
+
+    @staticmethod
+    def end(token) -> None:
+        metrics_store.end()
+        if token is not None:
+            current_query_stats.reset(token)
+
+    @staticmethod
+    def observe(request, response, start: float, stats: QueryStats) -> None:
+        resolver_match = getattr(request, "resolver_match", None)
+        # Content-Length is set by CommonMiddleware on every non-streaming response
+        size = response.get("Content-Length")
+        metrics_store.observe(
+            route=resolver_match.route if resolver_match else UNMATCHED_ROUTE,
+            method=request.method,
+            status=response.status_code,
+            duration=time.perf_counter() - start,
+            size=int(size) if size is not None else None,
+            queries=stats.count,
+            query_time=stats.duration,
+        )
@@ -0,0 +1,69 @@
+import random
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from config.middlewares.abstract import AbstractMiddleware
+from core.utils.profiling import PROFILE_HEADER, RequestProfile, is_signed_profile_header, profile_store
+
+
+class ProfilingMiddleware(AbstractMiddleware):
+    """
+    Profiles a `PROFILING_SAMPLE_RATE` fraction of the requests, and every request carrying
+    a valid `X-Profile` header (see the `dump_profiles --sign` management command).
+
+    A profiled request is sampled by a `RequestProfile` thread every `PROFILING_INTERVAL_MS`,
+    and its collapsed stacks are added to the profile of its view in `profile_store`.
+    Other requests only pay for a random number and a header lookup.
+    Under ASGI the per-request thread sync views run on is profiled along with the event loop.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+
+    def is_profiled(self, request) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        header = request.headers.get(PROFILE_HEADER)
+        return bool(header) and is_signed_profile_header(header)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_profiled(request):
+            return self.get_response(request)
+
+        profile = RequestProfile(self.interval)
+        profile.add_current_thread()
+        profile.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.stop()
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.is_profiled(request):
+            return await self.get_response(request)
+
+        profile = RequestProfile(self.interval)
+        profile.add_current_thread()
+        # Thread sensitive code of a request always runs on the same thread
+        await sync_to_async(profile.add_current_thread, thread_sensitive=True)()
+        profile.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profile.stop()
+        return self.finish(request, response, profile)
+
+    @staticmethod
+    def finish(request, response, profile: RequestProfile):
+        resolver_match = getattr(request, "resolver_match", None)
+        view = resolver_match.view_name or resolver_match._func_path if resolver_match else "<unmatched>"
+        collapsed = profile.collapsed()
+        profile_store.add(view, collapsed)
+        response["X-Profile-Samples"] = str(sum(collapsed.values()))
+        return response
@@ -0,0 +1,97 @@
+import random
+from logging import getLogger
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from config.middlewares.abstract import AbstractMiddleware
+from core.utils.query_budget import QueryBudgetExceeded, QueryStats, current_query_stats
+
+logger = getLogger(__name__)
+
+
+class QueryBudgetMiddleware(AbstractMiddleware):
+    """
+    Counts the queries and database time of a sample of the requests.
+
+    A `QUERY_BUDGET_SAMPLE_RATE` fraction of the requests is measured through the
+    `core.utils.query_budget` execute wrapper, the others only pay for a context variable
+    lookup per query. For measured requests:
+
+    - queries run `QUERY_BUDGET_REPEATED_THRESHOLD` times or more with different parameters
+      are logged as a possible N+1;
+    - views declaring a `query_budget` (see `BaseAPIView`) that run more queries are logged,
+      or fail with `QueryBudgetExceeded` when `QUERY_BUDGET_STRICT` is set (in tests, where
+      every request is measured);
+    - with `QUERY_BUDGET_HEADERS`, the numbers are added to the response as `X-Query-*` headers.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.sample_rate = settings.QUERY_BUDGET_SAMPLE_RATE
+        self.strict = settings.QUERY_BUDGET_STRICT
+        self.add_headers = settings.QUERY_BUDGET_HEADERS
+        self.repeated_threshold = settings.QUERY_BUDGET_REPEATED_THRESHOLD
+
+    def is_sampled(self, request) -> bool:
+        return self.strict or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_sampled(request):
+            return self.get_response(request)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_stats.reset(token)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        if not self.is_sampled(request):
+            return await self.get_response(request)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_stats.reset(token)
+        return self.report(request, response, stats)
+
+    @staticmethod
+    def get_budget(request) -> Tuple[str, Optional[int]]:
+        """Return the name and the `query_budget` of the view that handled the request."""
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return "-", None
+        view_class = getattr(resolver_match.func, "cls", None) or getattr(resolver_match.func, "view_class", None)
+        return resolver_match.view_name or resolver_match._func_path, getattr(view_class, "query_budget", None)
+
+    def report(self, request, response, stats: QueryStats):
+        view, budget = self.get_budget(request)
+        repeated = stats.get_repeated(self.repeated_threshold)
+
+        if self.add_headers:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = f"{stats.duration_ms:.1f}"
+            if budget is not None:
+                response["X-Query-Budget"] = str(budget)
+            if repeated:
+                response["X-Query-Repeated"] = str(repeated[0][2])
+
+        for fingerprint, sql, count in repeated:
+            logger.warning("Possible N+1 in %s: query %s ran %d times: %s", view, fingerprint, count, sql)
+
+        if budget is not None and stats.count > budget:
+            message = f"{view} ran {stats.count} queries ({stats.duration_ms:.1f} ms), over its budget of {budget}"
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
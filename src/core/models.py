@@ -1,17 +1,53 @@
 from functools import reduce
 from operator import or_
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from django.db import models, router, transaction
-from django.db.models.deletion import CASCADE, Collector
-from django.db.models.fields.reverse_related import ForeignObjectRel
+from django.db.models import Q, signals
+from django.db.models.deletion import CASCADE
 from django.db.models.query import QuerySet
 from django.db.models.sql.subqueries import UpdateQuery
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
 from core.managers import SoftDeleteManager
-from core.utils.deletion import SOFT_DELETE_CASCADE
+from core.utils.deletion import SoftDeleteCollector, has_delete_actions, soft_delete_cascade
+
+
+def live_unique_constraints(*fields: str) -> List[models.UniqueConstraint]:
+    """
+    Return unique constraints for a SoftDeleteModel that only cover rows that are not soft deleted.
+
+    On PostgreSQL they are partial unique indexes (`WHERE deleted_at IS NULL`),
+    so a soft-deleted row never blocks a new one with the same value.
+    """
+    return [
+        models.UniqueConstraint(
+            fields=[field],
+            condition=Q(deleted_at__isnull=True),
+            name=f"%(app_label)s_%(class)s_{field}_live_uniq",
+        )
+        for field in fields
+    ]
+
+
+def live_indexes(*fields: str) -> List[models.Index]:
+    """
+    Return indexes for a SoftDeleteModel that only cover rows that are not soft deleted.
+
+    They match the `deleted_at IS NULL` filter added by SoftDeleteManager,
+    so live-row lookups never scan soft-deleted rows. Names are prefixed with the app label
+    and the model name, like those of `live_unique_constraints`, and end with `_live` to stay
+    within the 30 characters Django allows for index names.
+    """
+    return [
+        models.Index(
+            fields=[field],
+            condition=Q(deleted_at__isnull=True),
+            name=f"%(app_label)s_%(class)s_{field.lstrip('-')}_live",
+        )
+        for field in fields
+    ]
 
 
 class BaseModel(models.Model):
@@ -40,10 +76,26 @@ class SoftDeleteModel(BaseModel):
         """Return whether the object is soft-deleted."""
         return self.deleted_at is not None
 
-    def delete(self, using: Optional[str] = None, keep_parents: bool = False) -> None:
+    def delete(
+        self, using: Optional[str] = None, keep_parents: bool = False, set_based: bool = False
+    ) -> Optional[Dict[str, int]]:
         """
         Soft delete the object by setting the deleted_at timestamp.
+
+        With `set_based=True` the cascade is performed with one UPDATE per related model and level
+        instead of loading and deleting every child instance, and the number of soft-deleted
+        rows per model label is returned.
+
+        With `keep_parents=True` the relations pointing at the parent models (multi-table
+        inheritance) are left alone, in both modes.
         """
+        if set_based:
+            queryset = self.__class__._base_manager.filter(pk=self.pk)
+            self.deleted_at = timezone.now()
+            return soft_delete_cascade(
+                queryset, using=using, deleted_at=self.deleted_at, keep_parents=keep_parents
+            )
+
         self._perform_on_delete(using=using, keep_parents=keep_parents)
         self.deleted_at = timezone.now()
         self.save(update_fields=["deleted_at"])
@@ -51,8 +103,29 @@ class SoftDeleteModel(BaseModel):
     def hard_delete(self, using: Optional[str] = None, keep_parents: bool = False) -> None:
         """
         Permanently delete the object from the database.
+
+        Objects without related delete actions, parents or delete signal receivers
+        are removed with a single DELETE, skipping the Collector.
         """
-        super().delete(using=using, keep_parents=keep_parents)
+        model = self.__class__
+        if (
+            has_delete_actions(model)
+            or model._meta.parents
+            or signals.pre_delete.has_listeners(model)
+            or signals.post_delete.has_listeners(model)
+            or any(hasattr(field, "bulk_related_objects") for field in model._meta.private_fields)
+        ):
+            super().delete(using=using, keep_parents=keep_parents)
+            return
+
+        if self.pk is None:
+            raise ValueError(
+                "%s object can't be deleted because its %s attribute is set to None."
+                % (self._meta.object_name, self._meta.pk.attname)
+            )
+        using = using or router.db_for_write(model, instance=self)
+        model._base_manager.using(using).filter(pk=self.pk)._raw_delete(using)
+        setattr(self, self._meta.pk.attname, None)
 
     def restore(self) -> None:
         """
@@ -70,68 +143,60 @@ class SoftDeleteModel(BaseModel):
 
         Since we override the base model delete() method for soft deletion,
         on_delete actions are not automatically performed anymore.
-        This method manually runs the ORM Collector to fetch all
+        This method manually runs a SoftDeleteCollector to fetch all
         related instances and modify them according to their on_delete actions.
+        CASCADE relations are only marked for soft delete by the collector,
+        so the shared field metadata is never modified and concurrent deletes are safe.
 
         Args:
             using: The database alias to use
             keep_parents: Whether to keep parent models when deleting
         """
-        # Temporarily replace CASCADE actions with our custom SOFT_DELETE_CASCADE
-        cascade_fields: List[ForeignObjectRel] = []
-        for field in self._meta.get_fields():
-            if isinstance(field, ForeignObjectRel) and field.on_delete == CASCADE:
-                cascade_fields.append(field)
-                field.on_delete = SOFT_DELETE_CASCADE
-
-        # Ensure we revert CASCADE actions even if errors occur
-        try:
-            # Collect instances for updating and soft deleting
-            using = using or router.db_for_write(self.__class__, instance=self)
-            collector = Collector(using=using)
-            collector.collect(objs=[self], keep_parents=keep_parents)
-
-            with transaction.atomic(using=using, savepoint=False):
-                # Handle only non-CASCADE field updates (like SET_NULL, SET_DEFAULT)
-                for (field, value), instances_list in collector.field_updates.items():
-                    # Skip processing if the field relates to a CASCADE relationship we're handling
-                    if any(field == cascade_field for cascade_field in cascade_fields):
-                        continue
-
-                    updates = []
-                    objs = []
-                    for instances in instances_list:
-                        if isinstance(instances, QuerySet) and instances._result_cache is None:
-                            updates.append(instances)
-                        else:
-                            objs.extend(instances)
-
-                    # Handle QuerySet updates
-                    if updates:
-                        combined_updates = reduce(or_, updates)
-                        combined_updates.update(**{field.name: value})
-
-                    # Handle direct object updates
-                    if objs:
-                        model = objs[0].__class__
-                        query = UpdateQuery(model)
-                        query.update_batch(
-                            pk_list=list({obj.pk for obj in objs}),
-                            values={field.name: value},
-                            using=using,
-                        )
-
-                # Soft delete all directly related instances
-                for instance in getattr(collector, "soft_deletes", []):
-                    if hasattr(instance, "is_deleted"):
-                        if not instance.is_deleted:
+        # Nothing references this model through an active on_delete action
+        if not has_delete_actions(self.__class__):
+            return
+
+        # Collect instances for updating and soft deleting
+        using = using or router.db_for_write(self.__class__, instance=self)
+        collector = SoftDeleteCollector(using=using, origin=self)
+        collector.collect(objs=[self], keep_parents=keep_parents)
+
+        with transaction.atomic(using=using, savepoint=False):
+            # Handle only non-CASCADE field updates (like SET_NULL, SET_DEFAULT)
+            for (field, value), instances_list in collector.field_updates.items():
+                # Skip processing if the field relates to a CASCADE relationship we're handling
+                if field.remote_field.on_delete is CASCADE:
+                    continue
+
+                updates = []
+                objs = []
+                for instances in instances_list:
+                    if isinstance(instances, QuerySet) and instances._result_cache is None:
+                        updates.append(instances)
+                    else:
+                        objs.extend(instances)
+
+                # Handle QuerySet updates
+                if updates:
+                    combined_updates = reduce(or_, updates)
+                    combined_updates.update(**{field.name: value})
+
+                # Handle direct object updates
+                if objs:
+                    model = objs[0].__class__
+                    query = UpdateQuery(model)
+                    query.update_batch(
+                        pk_list=list({obj.pk for obj in objs}),
+                        values={field.name: value},
+                        using=using,
+                    )
+
+            # Soft delete all directly related instances
+            for instance in collector.soft_deletes:
+                if hasattr(instance, "is_deleted"):
+                    if not instance.is_deleted:
+                        instance.delete()
+                elif hasattr(instance, "deleted_at"):
+                    if instance.deleted_at is None:
+                        if hasattr(instance, "delete"):
                             instance.delete()
-                    elif hasattr(instance, "deleted_at"):
-                        if instance.deleted_at is None:
-                            if hasattr(instance, "delete"):
-                                instance.delete()
-
-        finally:
-            # Restore original CASCADE actions
-            for field in cascade_fields:
-                field.on_delete = CASCADE
@@ -0,0 +1,85 @@
+"""
+Models used by the tests only. They belong to the core app but have no migrations,
+their tables are created by `TestModelsMixin`.
+"""
+
+from django.db import models
+
+from core.models import SoftDeleteModel
+
+
+class Author(SoftDeleteModel):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "core"
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "core"
+
+
+class Book(SoftDeleteModel):
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="books")
+    tags = models.ManyToManyField(Tag, related_name="books")
+    title = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "core"
+
+
+class Review(models.Model):
+    """Only referenced through a hidden relation."""
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+class Contract(models.Model):
+    author = models.ForeignKey(Author, on_delete=models.PROTECT, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+class Royalty(models.Model):
+    author = models.ForeignKey(Author, on_delete=models.RESTRICT, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+class Fan(models.Model):
+    author = models.ForeignKey(Author, null=True, on_delete=models.SET_NULL, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+class Place(SoftDeleteModel):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "core"
+
+
+class Restaurant(Place):
+    serves_pizza = models.BooleanField(default=False)
+
+    class Meta:
+        app_label = "core"
+
+
+class Booking(models.Model):
+    place = models.ForeignKey(Place, on_delete=models.PROTECT, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+TEST_MODELS = (Author, Tag, Book, Review, Contract, Royalty, Fan, Place, Restaurant, Booking)
@@ -0,0 +1,82 @@
+import tempfile
+
+from account.models import User
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.api.authentication import CachedJWTAuthentication
+from core.api.tokens import VersionedRefreshToken
+from core.utils.user_cache import local_user_cache
+
+
+class UserView(APIView):
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        return Response({"id": request.user.pk})
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        backend = "django.core.cache.backends.filebased.FileBasedCache"
+        shared_cache = override_settings(CACHES={"default": {"BACKEND": backend, "LOCATION": cache_dir.name}})
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        local_user_cache.clear()
+        self.addCleanup(local_user_cache.clear)
+
+        self.user = User.objects.create_user("user", "password", first_name="User", email="user@example.com")
+        self.token = str(VersionedRefreshToken.for_user(self.user).access_token)
+
+    def get(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return UserView.as_view()(request)
+
+    def test_user_is_cached(self):
+        self.assertEqual(self.get().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().data, {"id": self.user.pk})
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        # The admin "delete selected" action
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).delete()
+
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_hard_deleted_user_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).hard_delete()
+
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_per_process_cache_is_bypassed(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual(self.get().status_code, 200)
+            with self.assertNumQueries(1):
+                self.assertEqual(self.get().status_code, 200)
+
+            # Skips invalidate_users(), as the version bump of another worker would never reach this one
+            QuerySet.update(User.objects.filter(pk=self.user.pk), is_active=False)
+
+            self.assertEqual(self.get().status_code, 401)
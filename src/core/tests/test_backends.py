@@ -0,0 +1,35 @@
+from unittest import mock
+
+from account.models import User
+from django.contrib.auth import authenticate
+from django.http import HttpRequest
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+
+from core.utils.hashing import HashingSaturated, hashing_executor
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class OffloadedModelBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user("user", "password", first_name="User", email="user@example.com")
+
+    def setUp(self):
+        saturated = mock.patch.object(hashing_executor, "run", side_effect=HashingSaturated(wait=1))
+        saturated.start()
+        self.addCleanup(saturated.stop)
+
+    def test_saturated_drf_login(self):
+        with self.assertRaises(HashingSaturated):
+            authenticate(Request(HttpRequest()), username="user", password="password")
+
+    def test_saturated_plain_login(self):
+        self.assertIsNone(authenticate(HttpRequest(), username="user", password="password"))
+        self.assertIsNone(authenticate(None, username="missing", password="password"))
+
+    def test_saturated_admin_login(self):
+        response = self.client.post("/admin/login/", {"username": "user", "password": "password"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
@@ -0,0 +1,50 @@
+import os
+import runpy
+from unittest import mock
+
+from config.settings import base
+from django.db import connection
+from django.test import SimpleTestCase
+
+from core.utils.db_pool import get_pool_stats, is_pooled
+
+
+class PoolStatsTests(SimpleTestCase):
+    def test_unpooled(self):
+        self.assertFalse(is_pooled())
+        self.assertIsNone(get_pool_stats())
+
+    def test_pooled(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {"pool_size": 2, "pool_available": 1, "requests_waiting": 0}
+
+        with mock.patch.object(connection, "pool", pool, create=True):
+            self.assertTrue(is_pooled())
+            self.assertEqual(get_pool_stats(), {"pool_size": 2, "pool_available": 1, "requests_waiting": 0})
+
+
+class PoolSettingsTests(SimpleTestCase):
+    def load_settings(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return runpy.run_path(base.__file__)
+
+    def test_disabled(self):
+        database = self.load_settings(DB_POOL_ENABLED="False")["DATABASES"]["default"]
+
+        self.assertNotIn("pool", database.get("OPTIONS", {}))
+        self.assertEqual(database["CONN_MAX_AGE"], 600)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+
+    def test_enabled(self):
+        database = self.load_settings(
+            DB_POOL_ENABLED="True",
+            DB_POOL_MIN_SIZE="4",
+            DB_POOL_MAX_SIZE="20",
+            DB_POOL_TIMEOUT="2.5",
+            DB_POOL_MAX_IDLE="60",
+        )["DATABASES"]["default"]
+
+        self.assertEqual(database["OPTIONS"]["pool"], {"min_size": 4, "max_size": 20, "timeout": 2.5, "max_idle": 60})
+        # Connections go back to the pool at the end of every request
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertFalse(database["CONN_HEALTH_CHECKS"])
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models import CASCADE, ProtectedError, RestrictedError
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from core.tests.models import Author, Book, Booking, Contract, Fan, Place, Restaurant, Review, Royalty, Tag
+from core.tests.utils import TestModelsMixin
+from core.utils.deletion import get_deletion_plan, has_delete_actions
+
+
+class DeletionPlanTests(TestModelsMixin, TestCase):
+    def test_plan_includes_hidden_relations(self):
+        fields = {relation.field for relation in get_deletion_plan(Book)}
+
+        self.assertIn(Review._meta.get_field("book"), fields)
+        self.assertIn(Book.tags.through._meta.get_field("book"), fields)
+        # Only referenced by the auto-created many-to-many table
+        self.assertTrue(has_delete_actions(Tag))
+
+    def test_hard_delete_cascades_through_hidden_relations(self):
+        author = Author.objects.create(name="author")
+        book = Book.objects.create(author=author, title="book")
+        tag = Tag.objects.create(name="tag")
+        book.tags.add(tag)
+        Review.objects.create(book=book)
+
+        book.hard_delete()
+
+        self.assertFalse(Book.all_objects.exists())
+        self.assertFalse(Review.objects.exists())
+        self.assertFalse(Book.tags.through.objects.exists())
+        self.assertTrue(Tag.objects.filter(pk=tag.pk).exists())
+
+
+class SetBasedSoftDeleteTests(TestModelsMixin, TestCase):
+    def test_cascades_to_children(self):
+        author = Author.objects.create(name="author")
+        Book.objects.create(author=author, title="book")
+
+        counts = author.delete(set_based=True)
+
+        self.assertEqual(counts, {"core.Author": 1, "core.Book": 1})
+        self.assertFalse(Book.objects.exists())
+
+    def test_hidden_protect_and_restrict(self):
+        for model, error in ((Contract, ProtectedError), (Royalty, RestrictedError)):
+            with self.subTest(model=model.__name__):
+                author = Author.objects.create(name="author")
+                model.objects.create(author=author)
+
+                with self.assertRaises(error), transaction.atomic():
+                    author.delete(set_based=True)
+                self.assertTrue(Author.objects.filter(pk=author.pk).exists())
+
+    def test_hidden_set_null(self):
+        author = Author.objects.create(name="author")
+        fan = Fan.objects.create(author=author)
+
+        author.delete(set_based=True)
+
+        fan.refresh_from_db()
+        self.assertIsNone(fan.author_id)
+
+    def test_multi_table_inheritance_counts(self):
+        Place.objects.create(name="place")
+        restaurant = Restaurant.objects.create(name="restaurant")
+
+        counts = Place.objects.get(pk=restaurant.pk).delete(set_based=True)
+
+        # The same rows as QuerySet.delete() reports, one per table
+        self.assertEqual(counts, {"core.Place": 1, "core.Restaurant": 1})
+        self.assertFalse(Restaurant.objects.exists())
+        self.assertEqual(Place.objects.count(), 1)
+
+        Restaurant.objects.create(name="restaurant")
+        self.assertEqual(Place.objects.all().soft_delete(), (3, {"core.Place": 2, "core.Restaurant": 1}))
+
+    def test_keep_parents(self):
+        restaurant = Restaurant.objects.create(name="restaurant")
+        Booking.objects.create(place=restaurant)
+
+        # The booking references the parent row
+        with self.assertRaises(ProtectedError), transaction.atomic():
+            restaurant.delete(set_based=True)
+
+        restaurant.delete(set_based=True, keep_parents=True)
+        self.assertFalse(Restaurant.objects.exists())
+
+
+@skipUnlessDBFeature("test_db_allows_multiple_connections")
+class ConcurrentDeleteTests(TestModelsMixin, TransactionTestCase):
+    """Soft deletes, hard deletes and restores of the same models running in parallel threads."""
+
+    authors = 30
+    books_per_author = 3
+
+    def run_in_thread(self, operation, pk):
+        try:
+            operation(Author.all_objects.get(pk=pk))
+        finally:
+            connection.close()
+
+    def test_concurrent_soft_and_hard_deletes(self):
+        pks = []
+        for i in range(self.authors):
+            author = Author.objects.create(name=f"author {i}")
+            Book.objects.bulk_create(
+                Book(author=author, title=f"book {j}") for j in range(self.books_per_author)
+            )
+            pks.append(author.pk)
+        soft_pks, hard_pks, restored_pks = pks[0::3], pks[1::3], pks[2::3]
+        Author.objects.filter(pk__in=restored_pks).delete()
+
+        operations = (
+            [(Author.delete, pk) for pk in soft_pks]
+            + [(Author.hard_delete, pk) for pk in hard_pks]
+            + [(Author.restore, pk) for pk in restored_pks]
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(self.run_in_thread, *operation) for operation in operations]:
+                future.result()
+
+        # Soft-deleted authors soft delete their books, hard-deleted ones really delete them
+        self.assertEqual(set(Author.objects.deleted().values_list("pk", flat=True)), set(soft_pks))
+        self.assertEqual(
+            Book.objects.deleted().filter(author__in=soft_pks).count(), len(soft_pks) * self.books_per_author
+        )
+        self.assertFalse(Author.all_objects.filter(pk__in=hard_pks).exists())
+        self.assertFalse(Book.all_objects.filter(author__in=hard_pks).exists())
+        # Restored authors come back alone, their books stay deleted
+        self.assertEqual(set(Author.objects.values_list("pk", flat=True)), set(restored_pks))
+        self.assertEqual(Book.objects.count(), 0)
+        self.assertIs(Book._meta.get_field("author").remote_field.on_delete, CASCADE)
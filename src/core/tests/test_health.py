@@ -0,0 +1,113 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.utils.health import HealthCheckFailed, HealthChecker, check_cache, check_database
+
+PATH = "/api/v1/misc/ready/"
+
+
+class CountingCheck:
+    def __init__(self, error: Exception = None, event: threading.Event = None):
+        self.calls = 0
+        self.error = error
+        self.event = event
+
+    def __call__(self):
+        self.calls += 1
+        if self.event is not None:
+            self.event.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+
+@override_settings(HEALTH_CACHE_TTL=60, HEALTH_CHECK_TIMEOUT=1)
+class HealthCheckerTests(SimpleTestCase):
+    def make_checker(self, **checks) -> HealthChecker:
+        patcher = mock.patch.dict("core.utils.health.health_checks", checks, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return HealthChecker()
+
+    def test_report(self):
+        checker = self.make_checker(ok=CountingCheck(), failing=CountingCheck(HealthCheckFailed("Broken")))
+
+        report = checker.get_report()
+
+        self.assertEqual(report["status"], "error")
+        self.assertEqual(report["checks"]["ok"]["status"], "ok")
+        self.assertEqual(report["checks"]["ok"]["calls"], 1)
+        self.assertIn("duration_ms", report["checks"]["ok"])
+        self.assertEqual(report["checks"]["failing"], {"status": "error", "error": "Broken"})
+
+    def test_report_is_cached(self):
+        check = CountingCheck()
+        checker = self.make_checker(check=check)
+
+        self.assertEqual(checker.get_report(), checker.get_report())
+        self.assertEqual(check.calls, 1)
+
+    @override_settings(HEALTH_CACHE_TTL=0)
+    def test_expired_report_runs_again(self):
+        check = CountingCheck()
+        checker = self.make_checker(check=check)
+
+        checker.get_report()
+        self.assertEqual(checker.get_report()["checks"]["check"]["calls"], 2)
+
+    @override_settings(HEALTH_CACHE_TTL=0, HEALTH_CHECK_TIMEOUT=0.05)
+    def test_timeout(self):
+        event = threading.Event()
+        self.addCleanup(event.set)
+        hung, ok = CountingCheck(event=event), CountingCheck()
+        checker = self.make_checker(hung=hung, ok=ok)
+
+        for _ in range(2):
+            report = checker.get_report()
+
+            self.assertEqual(report["status"], "error")
+            self.assertEqual(report["checks"]["hung"], {"status": "error", "error": "Timed out after 0.05s"})
+            self.assertEqual(report["checks"]["ok"]["status"], "ok")
+        # Still running from the first report, never started twice
+        self.assertEqual(hung.calls, 1)
+        self.assertEqual(ok.calls, 2)
+
+        event.set()
+        checker._running["hung"].result(5)
+        self.assertEqual(checker.get_report()["status"], "ok")
+        self.assertEqual(hung.calls, 2)
+
+
+class ReadinessViewTests(SimpleTestCase):
+    def get(self, **checks):
+        with (
+            mock.patch.dict("core.utils.health.health_checks", checks, clear=True),
+            mock.patch("api.v1.core.views.misc.health_checker", HealthChecker()),
+        ):
+            return self.client.get(PATH)
+
+    def test_ready(self):
+        response = self.get(ok=CountingCheck())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ok")
+
+    def test_not_ready(self):
+        response = self.get(ok=CountingCheck(), failing=CountingCheck(HealthCheckFailed("Broken")))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"]["failing"]["error"], "Broken")
+
+
+class ChecksTests(TestCase):
+    def test_database(self):
+        details = check_database()
+
+        self.assertIn("round_trip_ms", details)
+        # SQLite connections aren't pooled
+        self.assertNotIn("pool", details)
+
+    def test_cache(self):
+        self.assertEqual(check_cache(), {})
@@ -0,0 +1,198 @@
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.utils import logging as core_logging
+from core.utils.logging import (
+    NonBlockingQueueHandler,
+    RoutedQueueListener,
+    TelegramErrorHandler,
+    get_log_queue,
+    get_queue_stats,
+)
+
+
+class StubTelegram(ThreadingHTTPServer):
+    """Local stand-in for the Bot API, answering the first `rate_limited` requests with a 429."""
+
+    def __init__(self, rate_limited: int = 0):
+        self.messages = []
+        self.rate_limited = rate_limited
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), StubTelegramHandler)
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubTelegramHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            if self.server.rate_limited:
+                self.server.rate_limited -= 1
+                status, payload = 429, {"ok": False, "parameters": {"retry_after": 0.1}}
+            else:
+                self.server.messages.append(body["text"])
+                status, payload = 200, {"ok": True}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_record(error: int = 0) -> logging.LogRecord:
+    try:
+        # One fingerprint per error type
+        raise [ValueError, KeyError, TypeError, OSError, RuntimeError][error]("boom")
+    except Exception as e:
+        exc_info = (type(e), e, e.__traceback__)
+        return logging.LogRecord("test", logging.ERROR, __file__, 1, f"error {error}", None, exc_info)
+
+
+class TelegramErrorHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.server = StubTelegram()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def make_handler(self, **kwargs) -> TelegramErrorHandler:
+        handler = TelegramErrorHandler("token", "chat", api_base=self.server.api_base, **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def wait_for_messages(self, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while len(self.server.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_first_record_is_sent_immediately(self):
+        handler = self.make_handler(window=60)
+
+        handler.handle(make_record())
+        self.wait_for_messages(1)
+        self.assertEqual(self.server.messages, ["error 0"])
+
+        for _ in range(10):
+            handler.handle(make_record())
+        handler.close()
+
+        self.assertEqual(self.server.messages[1], "*Repeated:* 10 more times in the last 60s\nerror 0")
+        self.assertEqual(handler.get_stats()["sent"], 2)
+        self.assertEqual(handler.get_stats()["coalesced"], 10)
+
+    def test_rate_limited(self):
+        self.server.rate_limited = 2
+        handler = self.make_handler(window=60)
+
+        handler.handle(make_record())
+        handler.close()
+
+        self.assertEqual(self.server.messages, ["error 0"])
+        self.assertEqual(handler.get_stats()["rate_limited"], 2)
+
+    def test_throughput(self):
+        handler = self.make_handler(window=0.2, max_pending=4)
+        threads, per_thread = 8, 2000
+
+        def emit_errors(thread):
+            for i in range(per_thread):
+                handler.handle(make_record((thread + i) % 5))
+
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(emit_errors, range(threads)))
+        handler.close()
+
+        stats = handler.get_stats()
+        reported = sum(
+            int(match.group(1)) if (match := re.search(r"\*Repeated:\* (\d+)", message)) else 1
+            for message in self.server.messages
+        )
+        # Every record is either reported, in a message or its count of repeats, or dropped
+        self.assertEqual(reported + stats["dropped"], threads * per_thread)
+        self.assertEqual(stats["failed"], 0)
+        self.assertLess(len(self.server.messages), 100)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class QueuePipelineTests(SimpleTestCase):
+    def make_handler(self, *handlers: logging.Handler, log_queue=None) -> NonBlockingQueueHandler:
+        # What dictConfig does for the queue handlers of LOGGING
+        log_queue = log_queue or get_log_queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.listener = RoutedQueueListener(log_queue, *handlers, respect_handler_level=True)
+        return handler
+
+    def wait_for_records(self, handler: ListHandler, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while len(handler.records) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_records_are_routed_to_their_listener(self):
+        app, errors = ListHandler(), ListHandler(logging.ERROR)
+        app_handler, errors_handler = self.make_handler(app), self.make_handler(errors)
+
+        app_handler.handle(logging.LogRecord("app", logging.INFO, __file__, 1, "hello %s", ("app",), None))
+        errors_handler.handle(logging.LogRecord("errors", logging.INFO, __file__, 1, "below level", None, None))
+        errors_handler.handle(make_record())
+        self.wait_for_records(app, 1)
+        self.wait_for_records(errors, 1)
+
+        self.assertEqual([record.getMessage() for record in app.records], ["hello app"])
+        self.assertEqual([record.getMessage() for record in errors.records], ["error 0"])
+        # Formatted on the dispatcher thread, the traceback is still there
+        self.assertIsNotNone(errors.records[0].exc_info)
+
+    def test_records_are_dropped_when_the_queue_is_full(self):
+        # Nothing reads this queue, the dispatcher thread serves the shared one
+        handler = self.make_handler(ListHandler(), log_queue=queue.Queue(maxsize=2))
+        dropped = get_queue_stats()["dropped"]
+
+        for i in range(5):
+            handler.handle(logging.LogRecord("app", logging.INFO, __file__, 1, f"record {i}", None, None))
+
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(get_queue_stats()["dropped"] - dropped, 3)
+
+    def test_stop_handles_queued_records(self):
+        target = ListHandler()
+        with mock.patch.object(core_logging, "_log_queue", queue.Queue()):
+            handler = self.make_handler(target)
+            for i in range(3):
+                record = logging.LogRecord("app", logging.INFO, __file__, 1, f"{i}", None, None)
+                handler.enqueue(handler.prepare(record))
+            dispatcher = core_logging._LogDispatcher()
+            dispatcher.ensure_started()
+            thread = dispatcher._thread
+
+            dispatcher.stop()
+
+            self.assertFalse(thread.is_alive())
+            self.assertEqual([record.getMessage() for record in target.records], ["0", "1", "2"])
+            self.assertTrue(get_log_queue().empty())
+            # Stopping again, or a dispatcher that never started, is a no-op
+            dispatcher.stop()
+            core_logging._LogDispatcher().stop()
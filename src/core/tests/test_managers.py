@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.tests.models import Author, Book
+from core.tests.utils import TestModelsMixin
+from core.utils.pagination import get_cached_count
+
+
+class SoftDeleteQuerySetTests(TestModelsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="author")
+        Book.objects.create(author=self.author, title="book")
+
+    def test_delete_cascades(self):
+        total, counts = Author.objects.filter(pk=self.author.pk).delete()
+
+        self.assertEqual((total, counts), (2, {"core.Author": 1, "core.Book": 1}))
+        self.assertEqual(Author.objects.deleted().count(), 1)
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_restore(self):
+        Author.objects.all().delete()
+
+        self.assertEqual(Author.objects.deleted().restore(), 1)
+        self.assertTrue(Author.objects.filter(pk=self.author.pk).exists())
+        # Like SoftDeleteModel.restore(), children stay deleted
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_restore_needs_deleted_objects(self):
+        Author.objects.all().delete()
+
+        with self.assertRaises(TypeError):
+            Author.objects.filter(pk=self.author.pk).restore()
+        self.assertEqual(Author.objects.with_deleted().filter(pk=self.author.pk).restore(), 1)
+
+    def test_bulk_operations_invalidate_cached_counts(self):
+        self.assertEqual(get_cached_count(Book.objects.all(), 60), 1)
+
+        Author.objects.all().delete()
+        self.assertEqual(get_cached_count(Book.objects.all(), 60), 0)
+
+        Book.objects.deleted().restore()
+        self.assertEqual(get_cached_count(Book.objects.all(), 60), 1)
+
+        Book.objects.with_deleted().hard_delete()
+        self.assertEqual(get_cached_count(Book.objects.all(), 60), 0)
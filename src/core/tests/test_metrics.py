@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase, override_settings
+
+PATH = "/api/v1/metrics/"
+
+
+class MetricsViewTests(SimpleTestCase):
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_closed_without_token(self):
+        self.assertEqual(self.client.get(PATH).status_code, 404)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=True)
+    def test_open_without_token_in_debug(self):
+        self.assertEqual(self.client.get(PATH).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="secret", DEBUG=False)
+    def test_token(self):
+        self.assertEqual(self.client.get(PATH).status_code, 401)
+        self.assertEqual(self.client.get(PATH, headers={"Authorization": "Bearer wrong"}).status_code, 401)
+
+        response = self.client.get(PATH, headers={"Authorization": "Bearer secret"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
@@ -0,0 +1,21 @@
+from asgiref.sync import iscoroutinefunction
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, SimpleTestCase
+
+from core.middlewares.dispatch import PathDispatchMiddleware
+
+
+class AsyncMiddlewareStackTests(SimpleTestCase):
+    def test_no_sync_hooks_registered_under_asgi(self):
+        handler = ASGIHandler()
+
+        # Only the admin hooks forwarded by PathDispatchMiddleware, as coroutines
+        for hooks in (handler._view_middleware, handler._template_response_middleware):
+            self.assertEqual([type(getattr(hook, "__self__", hook)) for hook in hooks], [PathDispatchMiddleware])
+            self.assertTrue(all(iscoroutinefunction(hook) for hook in hooks))
+
+    async def test_api_request(self):
+        response = await AsyncClient().get("/api/v1/misc/test/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "This is a test endpoint."})
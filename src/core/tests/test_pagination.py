@@ -0,0 +1,151 @@
+from unittest import mock
+
+from account.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from core.api.views import ListAPIView
+from core.tests.models import Author
+from core.tests.utils import TestModelsMixin
+from core.utils.pagination import KeysetPagination
+
+
+class UserKeysetListAPIView(ListAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+    queryset = User.objects.all()
+    pagination_class = KeysetPagination
+    values_fields = ("id", "username")
+
+
+class AuthorListAPIView(ListAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+    queryset = Author.objects.order_by("id")
+    values_fields = ("id", "name")
+
+
+class CachedCountAuthorListAPIView(AuthorListAPIView):
+    count_strategy = "cached"
+
+
+class EstimatedCountAuthorListAPIView(AuthorListAPIView):
+    count_strategy = "estimated"
+
+
+urlpatterns = [
+    path("api/v1/users/", UserKeysetListAPIView.as_view()),
+    path("api/v1/authors/cached/", CachedCountAuthorListAPIView.as_view()),
+    path("api/v1/authors/estimated/", EstimatedCountAuthorListAPIView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            User(username=f"user{i}", first_name="User", email=f"user{i}@example.com", password="!") for i in range(5)
+        )
+        cls.usernames = list(User.objects.order_by("-created_at", "-id").values_list("username", flat=True))
+
+    def test_cursor_paging(self):
+        usernames = []
+        url = "/api/v1/users/?per_page=2"
+        while url:
+            # The page only, never a COUNT(*)
+            with self.assertNumQueries(1):
+                data = self.client.get(url).json()
+            self.assertNotIn("total_count", data)
+            self.assertEqual(data["per_page"], 2)
+            usernames.extend(row["username"] for row in data["results"])
+            url = data["next"]
+
+        self.assertEqual(usernames, self.usernames)
+
+    def test_previous_page(self):
+        first = self.client.get("/api/v1/users/", {"per_page": 2}).json()
+        second = self.client.get(first["next"]).json()
+
+        self.assertIsNone(first["previous"])
+        self.assertEqual(self.client.get(second["previous"]).json()["results"], first["results"])
+
+    def test_with_total(self):
+        with self.assertNumQueries(2):
+            data = self.client.get("/api/v1/users/", {"per_page": 2, "with_total": "true"}).json()
+
+        self.assertEqual(data["total_count"], 5)
+        self.assertEqual([row["username"] for row in data["results"]], self.usernames[:2])
+        # The ordering column is only selected to build the cursors
+        self.assertEqual(set(data["results"][0]), {"id", "username"})
+
+    def test_empty(self):
+        User.objects.all().hard_delete()
+
+        data = self.client.get("/api/v1/users/", {"with_total": "1"}).json()
+
+        self.assertEqual(data["results"], [])
+        self.assertEqual(data["total_count"], 0)
+        self.assertIsNone(data["next"])
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class CountStrategyTests(TestModelsMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Author.objects.bulk_create(Author(name=f"author{i}") for i in range(3))
+
+    def get(self, path_, **params):
+        response = self.client.get(path_, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cached_count(self):
+        with self.assertNumQueries(2):
+            data = self.get("/api/v1/authors/cached/")
+        self.assertEqual(data["total_count"], 3)
+        self.assertEqual(data["count_strategy"], "cached")
+
+        # The count is served from the cache for every page of the same filters
+        for params in ({}, {"page": 2, "per_page": 2}):
+            with self.subTest(params=params), self.assertNumQueries(1):
+                self.assertEqual(self.get("/api/v1/authors/cached/", **params)["total_count"], 3)
+
+    def test_cached_count_is_invalidated_on_save_and_delete(self):
+        self.get("/api/v1/authors/cached/")
+
+        # post_save bumps the version of the model
+        author = Author.objects.create(name="author")
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get("/api/v1/authors/cached/")["total_count"], 4)
+
+        # A soft delete is a save
+        author.delete()
+        self.assertEqual(self.get("/api/v1/authors/cached/")["total_count"], 3)
+
+        # post_delete bumps it too
+        Author.all_objects.get(pk=author.pk).hard_delete()
+        Author.objects.filter(pk=Author.objects.first().pk).hard_delete()
+        self.assertEqual(self.get("/api/v1/authors/cached/")["total_count"], 2)
+
+    def test_estimated_count(self):
+        with mock.patch("core.utils.pagination.get_estimated_count", return_value=250_000) as get_estimated_count:
+            # The estimate replaces the COUNT(*), only the page is queried
+            with self.assertNumQueries(1):
+                data = self.get("/api/v1/authors/estimated/")
+
+        get_estimated_count.assert_called_once()
+        self.assertEqual(data["total_count"], 250_000)
+        self.assertEqual(data["count_strategy"], "estimated")
+        self.assertEqual(data["page_count"], 25_000)
+
+    def test_small_estimate_falls_back_to_exact_count(self):
+        for estimate in (None, 50):
+            with self.subTest(estimate=estimate):
+                with mock.patch("core.utils.pagination.get_estimated_count", return_value=estimate):
+                    data = self.get("/api/v1/authors/estimated/")
+
+                self.assertEqual(data["total_count"], 3)
+                self.assertEqual(data["count_strategy"], "exact")
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.utils.profiling import (
+    PROFILE_HEADER,
+    ProfileStore,
+    is_signed_profile_header,
+    merge_profiles,
+    profile_store,
+    sign_profile_header,
+)
+
+PATH = "/api/v1/misc/test/"
+
+
+class ProfilesDirectoryMixin:
+    """Points `profile_store` at a temporary directory for the test."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        patcher = mock.patch.object(profile_store, "_directory", self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_profile(self, pid: int, views: dict) -> None:
+        (self.directory / f"{pid}.json").write_text(json.dumps({"pid": pid, "views": views}))
+
+
+class ProfileStoreTests(ProfilesDirectoryMixin, SimpleTestCase):
+    def test_flush_and_merge(self):
+        store = ProfileStore(self.directory)
+        store.add("view", {"a;b": 2, "a;c": 1})
+        store.add("view", {"a;b": 1})
+        store.flush()
+        # Another process
+        self.write_profile(1, {"view": {"requests": 3, "stacks": {"a;b": 5}}, "other": {"requests": 1, "stacks": {}}})
+        (self.directory / "2.json").write_text("{")
+
+        profiles = merge_profiles(self.directory)
+
+        self.assertTrue((self.directory / f"{os.getpid()}.json").exists())
+        self.assertEqual(profiles["view"], (5, {"a;b": 8, "a;c": 1}))
+        self.assertEqual(profiles["other"], (1, {}))
+
+    def test_flush_only_writes_changes(self):
+        store = ProfileStore(self.directory)
+        store.flush()
+        self.assertEqual(list(self.directory.glob("*.json")), [])
+
+        store.add("view", {"a": 1})
+        path = self.directory / f"{os.getpid()}.json"
+        path.unlink()
+        store.flush()
+        self.assertFalse(path.exists())
+
+
+class DumpProfilesCommandTests(ProfilesDirectoryMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_profile(1, {"app:login": {"requests": 2, "stacks": {"a;b": 3}}})
+        self.write_profile(2, {"app:login": {"requests": 1, "stacks": {"a;b": 1, "a;c": 2}}})
+        self.write_profile(3, {"app:logout": {"requests": 1, "stacks": {"d": 1}}})
+
+    def call(self, *args) -> str:
+        stdout = StringIO()
+        call_command("dump_profiles", *args, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_single_flame_graph(self):
+        self.assertEqual(self.call().splitlines(), ["app:login;a;b 4", "app:login;a;c 2", "app:logout;d 1"])
+
+    def test_view(self):
+        self.assertEqual(self.call("--view", "app:logout").splitlines(), ["app:logout;d 1"])
+        with self.assertRaisesMessage(CommandError, "No profile recorded for app:unknown"):
+            self.call("--view", "app:unknown")
+
+    def test_output_and_reset(self):
+        with tempfile.TemporaryDirectory() as output:
+            self.call("--output", output, "--reset")
+
+            self.assertEqual((Path(output) / "app_login.folded").read_text(), "a;b 4\na;c 2\n")
+            self.assertEqual((Path(output) / "app_logout.folded").read_text(), "d 1\n")
+        self.assertEqual(list(self.directory.glob("*.json")), [])
+        self.assertEqual(self.call(), "No profiles recorded\n")
+
+    def test_sign(self):
+        header, value = self.call("--sign").strip().split(": ")
+
+        self.assertEqual(header, PROFILE_HEADER)
+        self.assertTrue(is_signed_profile_header(value))
+
+
+class ProfileHeaderTests(ProfilesDirectoryMixin, SimpleTestCase):
+    def test_signed_header(self):
+        value = sign_profile_header()
+
+        self.assertTrue(is_signed_profile_header(value))
+        self.assertFalse(is_signed_profile_header(value + "x"))
+        self.assertFalse(is_signed_profile_header("profile"))
+        with override_settings(PROFILING_SIGNATURE_MAX_AGE=-1):
+            self.assertFalse(is_signed_profile_header(value))
+
+    def test_signed_requests_are_profiled(self):
+        response = self.client.get(PATH, headers={PROFILE_HEADER: sign_profile_header()})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Profile-Samples", response)
+        profile_store.flush()
+        self.assertEqual(merge_profiles()["url_router:v1:health:test-api"][0], 1)
+
+    def test_other_requests_are_not_profiled(self):
+        for headers in ({}, {PROFILE_HEADER: "profile"}):
+            with self.subTest(headers=headers):
+                response = self.client.get(PATH, headers=headers)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("X-Profile-Samples", response)
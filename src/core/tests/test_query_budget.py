@@ -0,0 +1,55 @@
+from account.models import User
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework.response import Response
+
+from core.api.views import BaseAPIView
+from core.utils.query_budget import QueryBudgetExceeded
+
+
+class BudgetAPIView(BaseAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+    query_budget = 2
+
+    def get(self, request):
+        return Response({"count": User.objects.count(), "staff": User.objects.filter(is_staff=True).count()})
+
+
+class OverBudgetAPIView(BudgetAPIView):
+    def get(self, request):
+        response = super().get(request)
+        response.data["active"] = User.objects.filter(is_active=True).count()
+        return response
+
+
+urlpatterns = [
+    path("api/v1/budget/", BudgetAPIView.as_view()),
+    path("api/v1/over-budget/", OverBudgetAPIView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, QUERY_BUDGET_SAMPLE_RATE=1, QUERY_BUDGET_HEADERS=True)
+class QueryBudgetTests(TestCase):
+    def test_within_budget(self):
+        with self.assertNoLogs("core.middlewares.query_budget"):
+            response = self.client.get("/api/v1/budget/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Query-Count"], "2")
+        self.assertEqual(response["X-Query-Budget"], "2")
+
+    def test_over_budget_is_logged(self):
+        with self.assertLogs("core.middlewares.query_budget", "WARNING") as logs:
+            response = self.client.get("/api/v1/over-budget/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Query-Count"], "3")
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("ran 3 queries", logs.records[0].getMessage())
+        self.assertIn("over its budget of 2", logs.records[0].getMessage())
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_over_budget_fails_in_strict_mode(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "ran 3 queries"):
+            self.client.get("/api/v1/over-budget/")
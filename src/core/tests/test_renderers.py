@@ -0,0 +1,46 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core.api.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_same_output_as_json_renderer(self):
+        utc = datetime.timezone.utc
+        plus_five = datetime.timezone(datetime.timedelta(hours=5))
+        rows = [
+            ReturnDict({"id": 1, "name": "Ünïcödé ✓", "score": 1.5, "parent": None}, serializer=None),
+            ReturnDict({"id": 2, "name": "line\u2028separator\u2029", "tags": ("a", "b")}, serializer=None),
+        ]
+        self.assertSameOutput(
+            {
+                "success": True,
+                "message": _("OK"),
+                "results": ReturnList(rows, serializer=None),
+                "created_at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=utc),
+                "updated_at": datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=utc),
+                "local_at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=plus_five),
+                "naive_at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901),
+                "date": datetime.date(2025, 1, 2),
+                "time": datetime.time(3, 4, 5, 678901),
+                "duration": datetime.timedelta(days=1, seconds=5),
+                "price": Decimal("12.50"),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "counts": {1: 2, 3: 4},
+                "big": 2**70,
+            }
+        )
+
+    def test_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+        self.assertSameOutput({})
+        self.assertSameOutput([])
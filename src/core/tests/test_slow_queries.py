@@ -0,0 +1,36 @@
+from account.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.utils.query_budget import QueryStats, current_query_stats, query_stats_wrapper
+from core.utils.slow_queries import SlowQueryWrapper, slow_query_stats, slow_query_worker
+
+
+class SlowQueryWrapperTests(TestCase):
+    def setUp(self):
+        slow_query_stats.reset()
+        self.addCleanup(slow_query_stats.reset)
+
+    def test_explain_runs_outside_of_the_request(self):
+        connection.ensure_connection()
+        # Installed by CoreConfig.ready
+        self.assertIn(query_stats_wrapper, connection.execute_wrappers)
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        self.addCleanup(current_query_stats.reset, token)
+
+        with self.assertLogs("core.utils.slow_queries", "WARNING") as logs:
+            with (
+                CaptureQueriesContext(connection) as queries,
+                connection.execute_wrapper(SlowQueryWrapper(threshold_ms=0, explain_rate=1)),
+            ):
+                list(User.objects.filter(username="user"))
+            slow_query_worker.join()
+
+        # No EXPLAIN nor savepoint on the connection of the request, nor in its query budget
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("EXPLAIN", logs.output[0])
+        self.assertEqual([aggregate["count"] for aggregate in slow_query_stats.snapshot().values()], [1])
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.utils.throttling import LoginThrottle, TokenBucketThrottle
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login": "3/min"}})
+class LoginThrottleTests(SimpleTestCase):
+    view = SimpleNamespace(throttle_scope="login")
+
+    def setUp(self):
+        cache.clear()
+        TokenBucketThrottle._buckets.clear()
+        self.addCleanup(TokenBucketThrottle._buckets.clear)
+
+    def attempt(self, ip: str, username: str, forwarded_for: str = None) -> bool:
+        headers = {"HTTP_X_FORWARDED_FOR": forwarded_for} if forwarded_for else {}
+        request = APIRequestFactory().post("/", {"username": username}, format="json", REMOTE_ADDR=ip, **headers)
+        return LoginThrottle().allow_request(Request(request, parsers=[JSONParser()]), self.view)
+
+    def test_spoofed_forwarded_for(self):
+        for i in range(3):
+            self.assertTrue(self.attempt("10.0.0.1", f"user{i}", forwarded_for=f"1.1.1.{i}"))
+        self.assertFalse(self.attempt("10.0.0.1", "user3", forwarded_for="1.1.1.3"))
+
+    def test_rejected_username_keeps_ip_tokens(self):
+        for i in range(3):
+            self.assertTrue(self.attempt(f"10.0.0.{i}", "victim"))
+        self.assertFalse(self.attempt("10.0.0.9", "victim"))
+
+        for i in range(3):
+            self.assertTrue(self.attempt("10.0.0.9", f"user{i}"))
+        self.assertFalse(self.attempt("10.0.0.9", "user3"))
+
+    def test_rejected_shared_username_keeps_ip_tokens(self):
+        for i in range(3):
+            self.assertTrue(self.attempt(f"10.0.0.{i}", "victim"))
+        # Another process, only the shared counters know about the attempts
+        TokenBucketThrottle._buckets.clear()
+        self.assertFalse(self.attempt("10.0.0.9", "victim"))
+
+        for i in range(3):
+            self.assertTrue(self.attempt("10.0.0.9", f"user{i}"))
+        self.assertFalse(self.attempt("10.0.0.9", "user3"))
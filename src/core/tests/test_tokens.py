@@ -0,0 +1,94 @@
+import tempfile
+from unittest import mock
+
+from account.models import User
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.api.blacklist import blacklist_filter
+from core.api.tokens import FilteredRefreshToken, verify_tokens
+
+REFRESH_PATH = "/api/v1/auth/refresh/"
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class FilteredRefreshTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("user", "password", first_name="User", email="user@example.com")
+
+    def setUp(self):
+        self.raw_token = str(FilteredRefreshToken.for_user(self.user))
+
+    def test_blacklisted_by_another_process(self):
+        FilteredRefreshToken(self.raw_token)
+
+        # Without a shared cache, no generation bump reaches this process
+        jti = FilteredRefreshToken(self.raw_token)["jti"]
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+
+        with self.assertRaisesMessage(TokenError, "Token is blacklisted"):
+            FilteredRefreshToken(self.raw_token)
+        self.assertEqual(self.client.post(REFRESH_PATH, {"refresh": self.raw_token}).status_code, 401)
+
+    def test_replay_racing_with_refresh(self):
+        first, replay = FilteredRefreshToken(self.raw_token), FilteredRefreshToken(self.raw_token)
+
+        first.blacklist()
+        with self.assertRaisesMessage(TokenError, "Token is blacklisted"):
+            replay.blacklist()
+
+    def test_refresh_once(self):
+        response = self.client.post(REFRESH_PATH, {"refresh": self.raw_token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("refresh", response.json()["data"])
+        self.assertEqual(self.client.post(REFRESH_PATH, {"refresh": self.raw_token}).status_code, 401)
+
+    def test_refresh_of_deleted_user(self):
+        self.user.delete()
+
+        response = self.client.post(REFRESH_PATH, {"refresh": self.raw_token})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(User.objects.deleted().filter(pk=self.user.pk).exists())
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class VerifyTokensTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("user", "password", first_name="User", email="user@example.com")
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        backend = "django.core.cache.backends.filebased.FileBasedCache"
+        shared_cache = override_settings(CACHES={"default": {"BACKEND": backend, "LOCATION": cache_dir.name}})
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+
+    def test_batch_syncs_the_blacklist_once(self):
+        raw_tokens = [str(FilteredRefreshToken.for_user(self.user).access_token) for _ in range(3)]
+        blacklisted = FilteredRefreshToken.for_user(self.user)
+        blacklisted.blacklist()
+        raw_tokens.append(str(blacklisted))
+        # Builds the filter and caches the verified tokens
+        verify_tokens(raw_tokens)
+
+        with (
+            # The sync reads the blacklist generation from the cache
+            mock.patch.object(blacklist_filter, "_sync", wraps=blacklist_filter._sync) as sync,
+            mock.patch.object(
+                FileBasedCache, "get_many", autospec=True, side_effect=FileBasedCache.get_many
+            ) as cache_get_many,
+            # Only the candidate of the filter is looked up
+            self.assertNumQueries(1),
+        ):
+            errors = verify_tokens(raw_tokens)
+
+        self.assertEqual(errors, [None, None, None, "Token is blacklisted"])
+        self.assertEqual(sync.call_count, 1)
+        self.assertEqual(cache_get_many.call_count, 1)
@@ -0,0 +1,138 @@
+from unittest import mock
+
+from account.managers import UserQuerySet
+from account.models import User
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import identify_hasher, is_password_usable, make_password
+from django.test import TestCase, override_settings
+
+PBKDF2 = "django.contrib.auth.hashers.PBKDF2PasswordHasher"
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0, PASSWORD_HASHERS=[PBKDF2, MD5])
+class UserPasswordTests(TestCase):
+    def make_user(self, **fields) -> User:
+        return User(username="user", first_name="User", email="user@example.com", **fields)
+
+    def assertHashed(self, user: User, raw_password: str):
+        user.refresh_from_db()
+        self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+        self.assertTrue(user.check_password(raw_password))
+
+    def test_raw_passwords_are_hashed(self):
+        # Unusable-looking or hash-looking raw values, e.g. typed into the admin form
+        for raw_password in ("secret", "!secret", "pbkdf2_sha256$secret", "md5$secret"):
+            with self.subTest(raw_password=raw_password):
+                user = self.make_user(password=raw_password)
+                user.save()
+                self.assertHashed(user, raw_password)
+                user.hard_delete()
+
+    def test_raw_password_set_on_loaded_user(self):
+        user = self.make_user()
+        user.set_password("old")
+        user.save()
+
+        user = User.objects.get(pk=user.pk)
+        user.password = "!new"
+        user.save()
+
+        self.assertHashed(user, "!new")
+
+    def test_hashes_are_kept(self):
+        user = self.make_user(password=make_password("secret", hasher="md5"))
+        user.save()
+        encoded = user.password
+        user.save()
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+
+    def test_unusable_password_stays_unusable(self):
+        user = self.make_user()
+        user.set_unusable_password()
+        user.save()
+
+        user = User.objects.get(pk=user.pk)
+        user.first_name = "Renamed"
+        user.save()
+
+        user.refresh_from_db()
+        self.assertFalse(is_password_usable(user.password))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        user = self.make_user(password=make_password("secret", hasher="md5"))
+        user.save()
+
+        self.assertEqual(authenticate(None, username="user", password="secret"), user)
+
+        user.refresh_from_db()
+        self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+        self.assertTrue(user.check_password("secret"))
+
+    def test_wrong_password_keeps_outdated_hash(self):
+        encoded = make_password("secret", hasher="md5")
+        user = self.make_user(password=encoded)
+        user.save()
+
+        self.assertIsNone(authenticate(None, username="user", password="wrong"))
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class BulkCreateUsersTests(TestCase):
+    def test_bulk_create_users(self):
+        users = [
+            {"username": f"user{i}", "first_name": "User", "email": f"user{i}@example.com", "password": f"secret{i}"}
+            for i in range(5)
+        ]
+
+        # Two batches of 3 and 2 users, one insert each
+        with self.assertNumQueries(2):
+            created = User.objects.bulk_create_users(users, batch_size=3)
+
+        self.assertEqual(len(created), 5)
+        self.assertEqual(User.objects.count(), 5)
+        for i, user in enumerate(User.objects.order_by("username")):
+            self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+            self.assertTrue(user.check_password(f"secret{i}"))
+        # The dicts of the caller are left untouched
+        self.assertIn("password", users[0])
+
+
+class UserQuerySetTests(TestCase):
+    def setUp(self):
+        User.objects.bulk_create(
+            User(username=f"user{i}", first_name="User", email=f"user{i}@example.com", password="!") for i in range(5)
+        )
+        self.user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+        batch_size = mock.patch.object(UserQuerySet, "invalidation_batch_size", 2)
+        batch_size.start()
+        self.addCleanup(batch_size.stop)
+
+    def test_update_invalidates_batch_by_batch(self):
+        with mock.patch("account.managers.invalidate_users") as invalidate_users:
+            # A select and an update per batch of 2 users, then the select of an empty batch
+            with self.assertNumQueries(5):
+                rows = User.objects.filter(pk__gt=self.user_ids[0]).update(is_active=False)
+
+        self.assertEqual(rows, 4)
+        self.assertEqual(
+            [call.args[0] for call in invalidate_users.call_args_list], [self.user_ids[1:3], self.user_ids[3:]]
+        )
+        self.assertEqual(User.objects.filter(is_active=False).count(), 4)
+
+    def test_hard_delete_invalidates_batch_by_batch(self):
+        with mock.patch("account.managers.invalidate_users") as invalidate_users:
+            count, deleted = User.objects.all().hard_delete(chunk_size=3)
+
+        self.assertEqual(count, deleted["account.User"])
+        self.assertEqual(deleted["account.User"], 5)
+        self.assertEqual(
+            [call.args[0] for call in invalidate_users.call_args_list],
+            [self.user_ids[:2], self.user_ids[2:3], self.user_ids[3:]],
+        )
+        self.assertFalse(User.all_objects.exists())
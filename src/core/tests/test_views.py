@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework import serializers
+
+from core.api.views import AsyncListAPIView, ListAPIView
+from core.tests.models import Author
+from core.tests.utils import TestModelsMixin
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Author
+        fields = ("id", "name")
+
+
+class AuthorListAPIView(ListAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+    queryset = Author.objects.order_by("id")
+    serializer_class = AuthorSerializer
+
+
+class AuthorValuesListAPIView(AuthorListAPIView):
+    values_fields = ("id", "name")
+
+
+class UnpaginatedAuthorListAPIView(AuthorListAPIView):
+    pagination_class = None
+
+
+class AsyncAuthorListAPIView(AsyncListAPIView, AuthorListAPIView):
+    pass
+
+
+class AuthorExportAPIView(AuthorListAPIView):
+    export_chunk_size = 2
+
+
+class AuthorValuesExportAPIView(AuthorValuesListAPIView):
+    export_chunk_size = 2
+
+
+urlpatterns = [
+    path("api/v1/authors/", AuthorListAPIView.as_view()),
+    path("api/v1/authors/values/", AuthorValuesListAPIView.as_view()),
+    path("api/v1/authors/unpaginated/", UnpaginatedAuthorListAPIView.as_view()),
+    path("api/v1/authors/async/", AsyncAuthorListAPIView.as_view()),
+    path("api/v1/authors/export/", AuthorExportAPIView.as_view()),
+    path("api/v1/authors/values/export/", AuthorValuesExportAPIView.as_view()),
+]
+
+PAGINATED_PATHS = ("/api/v1/authors/", "/api/v1/authors/values/")
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class PaginatedListTests(TestModelsMixin, TestCase):
+    def create_authors(self, count: int):
+        Author.objects.bulk_create(Author(name=f"author{i}") for i in range(count))
+
+    def test_page(self):
+        self.create_authors(15)
+
+        for path_ in PAGINATED_PATHS:
+            with self.subTest(path=path_):
+                # The count and the page, whatever the size of the table
+                with self.assertNumQueries(2):
+                    response = self.client.get(path_, {"page": 2})
+
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                self.assertEqual([row["name"] for row in data["results"]], [f"author{i}" for i in range(10, 15)])
+                self.assertEqual(data["total_count"], 15)
+                self.assertEqual(data["page"], 2)
+                self.assertEqual(data["page_count"], 2)
+                self.assertEqual(data["per_page"], 10)
+
+    def test_empty_page(self):
+        for path_ in PAGINATED_PATHS:
+            with self.subTest(path=path_):
+                with self.assertNumQueries(1):
+                    response = self.client.get(path_)
+
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                self.assertEqual(data["results"], [])
+                self.assertEqual(data["total_count"], 0)
+                self.assertEqual(data["count_strategy"], "exact")
+                self.assertEqual(data["page"], 1)
+                self.assertEqual(data["page_count"], 1)
+
+    def test_unpaginated(self):
+        self.create_authors(3)
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/v1/authors/unpaginated/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 3)
+        self.assertNotIn("total_count", response.json())
+
+    def test_async_page(self):
+        self.create_authors(15)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/authors/async/", {"page": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 5)
+        self.assertEqual(response.json()["total_count"], 15)
+
+    def test_async_empty_page(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/v1/authors/async/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["results"], [])
+        self.assertEqual(data["total_count"], 0)
+        self.assertEqual(data["page_count"], 1)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class StreamingExportTests(TestModelsMixin, TestCase):
+    export_paths = ("/api/v1/authors/export/", "/api/v1/authors/values/export/")
+
+    @classmethod
+    def setUpTestData(cls):
+        Author.objects.bulk_create(Author(name=f"author{i}") for i in range(5))
+        cls.rows = [{"id": author.pk, "name": author.name} for author in Author.objects.order_by("id")]
+
+    def test_ndjson(self):
+        for path_ in self.export_paths:
+            with self.subTest(path=path_):
+                response = self.client.get(path_, {"export": "ndjson"})
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Content-Type"], "application/x-ndjson")
+                self.assertEqual(response["Content-Disposition"], 'attachment; filename="author.ndjson"')
+                # A chunk per batch of export_chunk_size rows
+                chunks = [chunk.decode() for chunk in response.streaming_content]
+                self.assertEqual(len(chunks), 3)
+                self.assertEqual([json.loads(line) for line in "".join(chunks).splitlines()], self.rows)
+
+    def test_csv(self):
+        for path_ in self.export_paths:
+            with self.subTest(path=path_):
+                response = self.client.get(path_, {"export": "csv"})
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Content-Type"], "text/csv")
+                self.assertEqual(response["Content-Disposition"], 'attachment; filename="author.csv"')
+                content = b"".join(response.streaming_content).decode()
+                self.assertTrue(content.startswith("id,name\r\n"))
+                rows = [{"id": int(row["id"]), "name": row["name"]} for row in csv.DictReader(io.StringIO(content))]
+                self.assertEqual(rows, self.rows)
+
+    def test_empty_export(self):
+        Author.objects.all().delete()
+
+        response = self.client.get("/api/v1/authors/export/", {"export": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+    def test_unsupported_format(self):
+        response = self.client.get("/api/v1/authors/export/", {"export": "xml"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "export: Unsupported export format: xml")
+
+    def test_without_export_is_paginated(self):
+        response = self.client.get("/api/v1/authors/export/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_count"], 5)
+
+    async def test_asgi_streams_asynchronously(self):
+        for path_ in ("/api/v1/authors/values/export/", "/api/v1/authors/async/"):
+            with self.subTest(path=path_):
+                response = await self.async_client.get(path_, {"export": "ndjson"})
+
+                self.assertEqual(response.status_code, 200)
+                # Pulled through _as_async_iterator, so Django doesn't buffer a sync iterator
+                self.assertTrue(response.is_async)
+                content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+                self.assertEqual([json.loads(line) for line in content.splitlines()], self.rows)
@@ -0,0 +1,22 @@
+from django.db import connection
+
+from core.tests.models import TEST_MODELS
+
+
+class TestModelsMixin:
+    """Creates the tables of the test models (`core.tests.models`) for the test case."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Before TestCase opens its transaction, SQLite can't change the schema inside one
+        with connection.schema_editor() as editor:
+            for model in TEST_MODELS:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(TEST_MODELS):
+                editor.delete_model(model)
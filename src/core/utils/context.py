@@ -0,0 +1,26 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from django.http import HttpRequest
+
+# The request being handled, set by core.middlewares.context.RequestContextMiddleware.
+# Sync views under ASGI run with a copy of the context, so they see it as well.
+current_request: ContextVar[Optional[HttpRequest]] = ContextVar("current_request", default=None)
+
+
+def get_request_context() -> Dict[str, str]:
+    """
+    Return the view, user, method and path of the request being handled, like `RequestContextFilter`.
+    """
+    request = current_request.get()
+    if request is None:
+        return {"view": "-", "user": "-", "method": "-", "path": "-"}
+
+    resolver_match = getattr(request, "resolver_match", None)
+    return {
+        "view": resolver_match.view_name or resolver_match._func_path if resolver_match else "-",
+        # API requests only get a user once DRF authenticates them
+        "user": getattr(getattr(request, "user", None), "username", None) or "Anonymous",
+        "method": request.method,
+        "path": request.path,
+    }
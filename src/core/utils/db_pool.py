@@ -0,0 +1,18 @@
+from typing import Dict, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def is_pooled(alias: str = DEFAULT_DB_ALIAS) -> bool:
+    return getattr(connections[alias], "pool", None) is not None
+
+
+def get_pool_stats(alias: str = DEFAULT_DB_ALIAS) -> Optional[Dict[str, int]]:
+    """
+    Return the statistics of the connection pool of the database (`pool_size`, `pool_available`,
+    `requests_waiting`, ...), or None when its connections aren't pooled (see `DB_POOL_ENABLED`).
+    """
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    return pool.get_stats()
@@ -1,21 +1,264 @@
-from django.db.models import ForeignObjectRel, QuerySet
-from django.db.models.deletion import Collector
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, router, transaction
+from django.db.models import QuerySet
+from django.db.models.deletion import (
+    CASCADE,
+    DO_NOTHING,
+    PROTECT,
+    RESTRICT,
+    Collector,
+    ProtectedError,
+    RestrictedError,
+)
+from django.db.models.signals import class_prepared
+from django.utils import timezone
 
-def SOFT_DELETE_CASCADE(
-    collector: Collector, field: ForeignObjectRel, sub_objs: QuerySet, using: str
-) -> None:
+
+class SoftDeleteCollector(Collector):
+    """
+    Collector that marks CASCADE targets for soft delete without recursive collection.
+
+    The soft-delete policy is carried by the collector instance instead of being patched
+    onto the shared `on_delete` metadata of the relations, so concurrent deletes
+    (soft or hard) in the same process never observe each other.
+    """
+
+    def __init__(self, using: str, origin=None) -> None:
+        super().__init__(using, origin=origin)
+        self.soft_deletes: List[models.Model] = []
+
+    def can_fast_delete(self, objs, from_field=None) -> bool:
+        # CASCADE targets must reach collect() to be marked for soft delete
+        if from_field is not None and from_field.remote_field.on_delete is CASCADE:
+            return False
+        return super().can_fast_delete(objs, from_field=from_field)
+
+    def collect(
+        self,
+        objs,
+        source=None,
+        nullable=False,
+        collect_related=True,
+        source_attr=None,
+        reverse_dependency=False,
+        keep_parents=False,
+        fail_on_restricted=True,
+    ) -> None:
+        """
+        Collect the objects being soft deleted and run the on_delete actions of their relations.
+
+        Calls coming from CASCADE (a `source` without `reverse_dependency`) only mark
+        the related objects for soft delete.
+        """
+        if source is not None and not reverse_dependency:
+            self.soft_deletes.extend(objs)
+            return
+
+        super().collect(
+            objs,
+            source=source,
+            nullable=nullable,
+            collect_related=collect_related,
+            source_attr=source_attr,
+            reverse_dependency=reverse_dependency,
+            keep_parents=keep_parents,
+            fail_on_restricted=fail_on_restricted,
+        )
+
+
+def is_soft_deletable(model: Type[models.Model]) -> bool:
+    """Return whether rows of the model are soft deleted through `deleted_at`."""
+    try:
+        model._meta.get_field("deleted_at")
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+class RelationPlan(NamedTuple):
+    """A reverse N-1 or 1-1 relation and what deleting its target does to the referencing rows."""
+
+    field: models.ForeignKey
+    related_model: Type[models.Model]
+    on_delete: Callable
+    soft: bool
+
+
+_deletion_plans: Dict[Type[models.Model], Tuple[RelationPlan, ...]] = {}
+_deletion_plans_lock = threading.Lock()
+
+
+def get_deletion_plan(model: Type[models.Model]) -> Tuple[RelationPlan, ...]:
+    """
+    Return the cached deletion plan of the model.
+
+    The plan lists the reverse N-1 and 1-1 relations that take part in a delete of the model,
+    the same candidates as Django's Collector (`get_candidate_relations_to_delete`): hidden ones
+    (`related_name="+"`, the foreign keys of auto-created many-to-many tables) included,
+    with their on_delete action and whether the referencing model is soft deletable.
+    It is built lazily once per process and dropped whenever a model class is prepared.
+    """
+    model = model._meta.concrete_model
+    plan = _deletion_plans.get(model)
+    if plan is not None:
+        return plan
+
+    with _deletion_plans_lock:
+        plan = _deletion_plans.get(model)
+        if plan is None:
+            plan = tuple(
+                RelationPlan(
+                    field=rel.field,
+                    related_model=rel.related_model._meta.concrete_model,
+                    on_delete=rel.on_delete,
+                    soft=is_soft_deletable(rel.related_model),
+                )
+                for rel in model._meta.get_fields(include_hidden=True)
+                if rel.auto_created and not rel.concrete and (rel.one_to_many or rel.one_to_one)
+            )
+            _deletion_plans[model] = plan
+    return plan
+
+
+def has_delete_actions(model: Type[models.Model]) -> bool:
+    """Return whether deleting rows of the model has to act on any related model."""
+    return any(relation.on_delete is not DO_NOTHING for relation in get_deletion_plan(model))
+
+
+def iter_deletion_plan(
+    model: Type[models.Model], path: Tuple[Type[models.Model], ...] = ()
+) -> Iterator[Tuple[int, RelationPlan]]:
+    """
+    Walk the relation graph the same way `soft_delete_cascade` does, parents first.
+
+    Yields:
+        The depth (starting at 1) and the relation plan of every visited relation
+    """
+    path = path + (model._meta.concrete_model,)
+    for relation in get_deletion_plan(model):
+        yield len(path), relation
+        if relation.on_delete is CASCADE and relation.soft and relation.related_model not in path:
+            yield from iter_deletion_plan(relation.related_model, path)
+
+
+def _clear_deletion_plans(**kwargs) -> None:
+    with _deletion_plans_lock:
+        _deletion_plans.clear()
+
+
+class_prepared.connect(_clear_deletion_plans, dispatch_uid="core.utils.deletion.clear_deletion_plans")
+
+
+def soft_delete_cascade(
+    queryset: QuerySet, using: Optional[str] = None, deleted_at=None, keep_parents: bool = False
+) -> Dict[str, int]:
     """
-    Custom CASCADE function that only marks objects for soft delete
-    without recursive collection.
+    Soft delete every row of the queryset together with its CASCADE children using set-based updates.
+
+    The relation graph is walked once and every model/level is handled with a single
+    `UPDATE ... WHERE fk IN (subquery)` statement, so no child instance is ever loaded.
+    Children are updated before their parents, which keeps the parent subqueries
+    (filtered on `deleted_at IS NULL`) valid for the whole walk.
+
+    On delete actions follow `SoftDeleteModel._perform_on_delete`:
+        - CASCADE: soft deletes live children of soft-deletable models, others are left untouched
+        - SET_NULL / SET_DEFAULT / SET(...): applied as a single UPDATE of the foreign key
+        - PROTECT / RESTRICT: raise if any referencing row exists
+        - DO_NOTHING: skipped
+
+    Models that are already part of the current cascade path (self or circular relations)
+    are soft deleted one level deep only.
 
     Args:
-        collector: The Django collector instance
-        field: The field relationship being processed
-        sub_objs: The QuerySet containing objects to process
+        queryset: The rows to soft delete
         using: The database alias to use
+        deleted_at: The timestamp to store, defaults to now
+        keep_parents: Skip the relations pointing at the parent models (multi-table inheritance)
+            of the queryset's model, as `Collector.collect(keep_parents=True)` does
+
+    Returns:
+        The number of soft-deleted rows per model label, e.g. {"account.User": 1}
     """
-    if not hasattr(collector, "soft_deletes"):
-        collector.soft_deletes = []
+    using = using or router.db_for_write(queryset.model)
+    deleted_at = deleted_at or timezone.now()
+    counts: Counter = Counter()
+
+    with transaction.atomic(using=using, savepoint=False):
+        _soft_delete_level(
+            queryset.using(using).filter(deleted_at__isnull=True),
+            using=using,
+            deleted_at=deleted_at,
+            counts=counts,
+            path=(queryset.model._meta.concrete_model,),
+            keep_parents=keep_parents,
+        )
+
+    return {label: count for label, count in counts.items() if count}
+
+
+def _soft_delete_level(
+    queryset: QuerySet,
+    using: str,
+    deleted_at,
+    counts: Counter,
+    path: Tuple[Type[models.Model], ...],
+    keep_parents: bool = False,
+) -> None:
+    """Apply on_delete actions for the children of `queryset`, then soft delete it."""
+    model = queryset.model
+    parents = set(model._meta.get_parent_list()) if keep_parents else set()
+
+    for relation in get_deletion_plan(model):
+        field = relation.field
+        on_delete = relation.on_delete
+        if on_delete is DO_NOTHING or field.remote_field.model in parents:
+            continue
+
+        parent_values = queryset.values(field.target_field.attname)
+        sub_objs = relation.related_model._base_manager.using(using).filter(
+            **{f"{field.attname}__in": parent_values}
+        )
+
+        if on_delete is CASCADE:
+            related_model = relation.related_model
+            if not relation.soft:
+                continue
+            live_objs = sub_objs.filter(deleted_at__isnull=True)
+            counted = counts[related_model._meta.label]
+            if related_model in path:
+                counts[related_model._meta.label] += live_objs.update(deleted_at=deleted_at)
+            else:
+                _soft_delete_level(live_objs, using, deleted_at, counts, path + (related_model,))
+            if field.remote_field.parent_link:
+                # Multi-table inheritance: the inherited deleted_at column lives in the table of
+                # this model, so the child's update already soft deleted these parent rows
+                counts[model._meta.label] += counts[related_model._meta.label] - counted
+        elif on_delete is PROTECT:
+            if sub_objs.exists():
+                raise ProtectedError(
+                    "Cannot delete some instances of model '%s' because they are "
+                    "referenced through a protected foreign key: '%s.%s'"
+                    % (model.__name__, relation.related_model.__name__, field.name),
+                    sub_objs,
+                )
+        elif on_delete is RESTRICT:
+            if sub_objs.exists():
+                raise RestrictedError(
+                    "Cannot delete some instances of model '%s' because they are "
+                    "referenced through restricted foreign keys: '%s.%s'"
+                    % (model.__name__, relation.related_model.__name__, field.name),
+                    sub_objs,
+                )
+        else:
+            # SET_NULL, SET_DEFAULT and SET(...) only register field updates
+            collector = Collector(using=using)
+            on_delete(collector, field, sub_objs, using)
+            for (update_field, value), instances_list in collector.field_updates.items():
+                for instances in instances_list:
+                    instances.update(**{update_field.name: value})
 
-    collector.soft_deletes.extend(list(sub_objs))
+    counts[model._meta.label] += queryset.update(deleted_at=deleted_at)
@@ -0,0 +1,172 @@
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+
+
+class HashingSaturated(exceptions.Throttled):
+    default_detail = _("Too many password checks in progress, please try again shortly.")
+    default_code = "hashing_saturated"
+
+
+def _init_worker(password_hashers: List[str]) -> None:
+    # Hashers only need PASSWORD_HASHERS, so workers skip the full django.setup()
+    if not settings.configured:
+        settings.configure(PASSWORD_HASHERS=password_hashers)
+
+
+class HashingExecutor:
+    """
+    Process pool that password hashing and checking are offloaded to.
+
+    Hashers are CPU-bound and hold the GIL for the whole computation, so running them in
+    worker processes keeps the request threads (and the event loop under ASGI) responsive.
+    At most `PASSWORD_HASHING_MAX_PENDING` operations are queued or running per process:
+    non-blocking submissions (logins) fail fast with `HashingSaturated` (a 429) beyond it,
+    blocking ones (user creation, bulk imports) wait for a free slot.
+    With `PASSWORD_HASHING_WORKERS = 0`, everything runs inline in the calling thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._pending = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                if settings.PASSWORD_HASHING_WORKERS <= 0:
+                    return None
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    # Forking a process with running threads isn't safe
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(list(settings.PASSWORD_HASHERS),),
+                )
+                self._slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+                self._pid = os.getpid()
+                self._pending = 0
+            return self._executor
+
+    def submit(self, fn: Callable, *args, blocking: bool = False) -> Future:
+        executor = self._get_executor()
+        if executor is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        slots = self._slots
+        if not slots.acquire(blocking=blocking):
+            with self._lock:
+                self._rejected += 1
+            raise HashingSaturated(wait=1)
+
+        with self._lock:
+            self._pending += 1
+
+        def release(_future):
+            with self._lock:
+                self._pending -= 1
+            slots.release()
+
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            release(None)
+            self.shutdown()
+            raise
+        future.add_done_callback(release)
+        return future
+
+    def run(self, fn: Callable, *args, blocking: bool = False):
+        return self.submit(fn, *args, blocking=blocking).result()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASHING_WORKERS if self._executor else 0,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_executor = HashingExecutor()
+atexit.register(hashing_executor.shutdown)
+
+
+def hash_password(password: Optional[str], blocking: bool = True) -> str:
+    """Offloaded `make_password`. Unusable passwords (None) are generated inline."""
+    if password is None:
+        return hashers.make_password(None)
+    return hashing_executor.run(hashers.make_password, password, blocking=blocking)
+
+
+def hash_passwords(passwords: Iterable[str]) -> List[str]:
+    """Hash the passwords in parallel on all workers, in the same order."""
+    futures = [hashing_executor.submit(hashers.make_password, password, blocking=True) for password in passwords]
+    return [future.result() for future in futures]
+
+
+def is_password_hash(encoded: Optional[str]) -> bool:
+    """Return whether the value was made by `make_password` with one of `PASSWORD_HASHERS`, not a raw password."""
+    if not encoded:
+        return False
+    try:
+        hashers.identify_hasher(encoded).decode(encoded)
+    except (ValueError, TypeError, IndexError, NotImplementedError):
+        return False
+    return True
+
+
+def must_update(encoded: str) -> bool:
+    """Return whether the hash was made by another hasher, or other parameters, than the preferred one."""
+    hasher = hashers.identify_hasher(encoded)
+    preferred = hashers.get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def verify_password(
+    password: Optional[str],
+    encoded: Optional[str],
+    setter: Optional[Callable[[str], None]] = None,
+    blocking: bool = True,
+) -> bool:
+    """
+    Offloaded `check_password`.
+
+    Like Django's, `setter` is called with the raw password when it is valid and its hash
+    is outdated (see `must_update`), so stored hashes are upgraded transparently whenever
+    `PASSWORD_HASHERS` changes.
+    """
+    if password is None or not hashers.is_password_usable(encoded):
+        return False
+    try:
+        outdated = must_update(encoded)
+    except ValueError:
+        return False
+
+    is_correct = hashing_executor.run(hashers.check_password, password, encoded, blocking=blocking)
+    if is_correct and outdated and setter is not None:
+        setter(password)
+    return is_correct
@@ -0,0 +1,167 @@
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from core.utils.db_pool import get_pool_stats, is_pooled
+
+
+class HealthCheckFailed(Exception):
+    """Raised by a readiness check, with the reason as message."""
+
+
+# Readiness checks: name -> function returning details (or None), raising when unhealthy
+health_checks: Dict[str, Callable[[], Optional[dict]]] = {}
+
+
+def register_check(name: str, check: Callable[[], Optional[dict]]) -> None:
+    """Add a check to the readiness endpoint. It runs in a worker thread, with a timeout."""
+    health_checks[name] = check
+
+
+def release_connection() -> None:
+    """
+    Give a pooled connection back to the pool, the checks run outside of the request cycle that
+    would. A persistent connection is kept for the next run, unless the database went away.
+    """
+    if is_pooled(connection.alias):
+        connection.close()
+    else:
+        connection.close_if_unusable_or_obsolete()
+
+
+def check_database() -> dict:
+    start = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        details = {"round_trip_ms": round((time.perf_counter() - start) * 1000, 2)}
+    finally:
+        release_connection()
+    pool_stats = get_pool_stats()
+    if pool_stats is not None:
+        details["pool"] = pool_stats
+    return details
+
+
+_migrations_applied = False
+
+
+def check_migrations() -> dict:
+    # Migrations only change with a deploy (a new process), so a passing check is never run again
+    global _migrations_applied
+    if not _migrations_applied:
+        try:
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        finally:
+            release_connection()
+        if plan:
+            raise HealthCheckFailed(f"{len(plan)} unapplied migration(s)")
+        _migrations_applied = True
+    return {"pending": 0}
+
+
+def check_cache() -> dict:
+    key = f"health:{uuid.uuid4().hex}"
+    cache.set(key, 1, 10)
+    if cache.get(key) != 1:
+        raise HealthCheckFailed("Cache did not return the value just set")
+    cache.delete(key)
+    return {}
+
+
+def check_disk() -> dict:
+    usage = shutil.disk_usage(Path(settings.BASE_DIR).parent / "logs")
+    free_mb = usage.free // (1024 * 1024)
+    if free_mb < settings.HEALTH_MIN_FREE_DISK_MB:
+        raise HealthCheckFailed(f"{free_mb} MB free under logs/")
+    return {"free_mb": free_mb}
+
+
+def check_log_queue() -> dict:
+    from core.utils.logging import get_queue_stats
+
+    stats = get_queue_stats()
+    # Dropping records already, or about to
+    if stats["queued"] >= stats["capacity"] * 0.9:
+        raise HealthCheckFailed(f"{stats['queued']} of {stats['capacity']} log records queued")
+    return {"queued": stats["queued"], "dropped": stats["dropped"]}
+
+
+register_check("database", check_database)
+register_check("migrations", check_migrations)
+register_check("cache", check_cache)
+register_check("disk", check_disk)
+register_check("log_queue", check_log_queue)
+
+
+class HealthChecker:
+    """
+    Runs the readiness checks in parallel, each with a `HEALTH_CHECK_TIMEOUT`, and caches
+    the report for `HEALTH_CACHE_TTL` seconds.
+
+    Concurrent probes wait for the single run in progress instead of starting their own,
+    so a storm of probes costs one run per TTL. A check still running from a previous run
+    (e.g. a hung database) is reported as timed out instead of being started again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running: Dict[str, Future] = {}
+        self._report: Optional[dict] = None
+        self._expires_at = 0.0
+
+    def get_report(self) -> dict:
+        with self._lock:
+            if self._report is None or time.monotonic() >= self._expires_at:
+                self._report = self._run()
+                self._expires_at = time.monotonic() + settings.HEALTH_CACHE_TTL
+            return self._report
+
+    def _run(self) -> dict:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(health_checks) + 2, thread_name_prefix="health")
+
+        started = {}
+        for name, check in health_checks.items():
+            future = self._running.get(name)
+            if future is None or future.done():
+                future = self._running[name] = self._executor.submit(self._timed, check)
+            started[name] = future
+        wait_futures(started.values(), timeout=settings.HEALTH_CHECK_TIMEOUT)
+
+        checks = {}
+        for name, future in started.items():
+            if not future.done():
+                checks[name] = {"status": "error", "error": f"Timed out after {settings.HEALTH_CHECK_TIMEOUT}s"}
+                continue
+            try:
+                details, duration = future.result()
+            except Exception as exc:
+                checks[name] = {"status": "error", "error": str(exc) or type(exc).__name__}
+            else:
+                checks[name] = {"status": "ok", "duration_ms": duration, **(details or {})}
+
+        healthy = all(check["status"] == "ok" for check in checks.values())
+        return {"status": "ok" if healthy else "error", "checks": checks}
+
+    @staticmethod
+    def _timed(check):
+        start = time.perf_counter()
+        details = check()
+        return details, round((time.perf_counter() - start) * 1000, 2)
+
+
+health_checker = HealthChecker()
@@ -1,26 +1,94 @@
+import atexit
+import copy
+import hashlib
 import logging
+import logging.handlers
+import os
 import queue
 import threading
+import time
 import traceback
+from typing import Dict, List, Optional
+
 import requests
 
 class TelegramErrorHandler(logging.Handler):
     """
     A logging handler that sends error logs to a Telegram chat via a bot.
-    It uses a background thread and a queue to avoid blocking the main thread.
+
+    Identical errors are grouped by a fingerprint (the exception type plus the innermost
+    `frames` frames of the traceback, or the logging call site for records without one).
+    The first record of a group is formatted and sent right away by a background thread,
+    further occurrences are only counted and reported in one message per group every
+    `window` seconds. A group stays open while it repeats, the first record after a quiet
+    window is sent right away again. At most `max_pending` groups are open at once, the
+    records of further groups are dropped and counted.
+    On a 429 the thread waits for Telegram's `retry_after` before sending again.
+    Pending messages are sent when the handler is closed (at shutdown).
     """
 
-    def __init__(self, bot_token, chat_id, level=logging.ERROR, max_queue=100):
+    def __init__(
+        self,
+        bot_token,
+        chat_id,
+        level=logging.ERROR,
+        window=60,
+        max_pending=100,
+        frames=5,
+        timeout=5,
+        api_base="https://api.telegram.org",
+    ):
         super().__init__(level)
-        self.api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.api_url = f"{api_base}/bot{bot_token}/sendMessage"
         self.chat_id = chat_id
-        self.queue = queue.Queue(maxsize=max_queue)
+        self.window = window
+        self.max_pending = max_pending
+        self.frames = frames
+        self.timeout = timeout
+
+        self._pending_lock = threading.Lock()
+        # Open groups: fingerprint -> [message, occurrences not reported yet]
+        self._pending: Dict[str, list] = {}
+        # First records of new groups, not sent yet
+        self._new: List[str] = []
+        self._stats = {"sent": 0, "coalesced": 0, "dropped": 0, "failed": 0, "rate_limited": 0}
+        self._dropped_since_report = 0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+        self.worker = None
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        # Threads don't survive a fork, restart it in worker processes
+        if (self.worker is None or not self.worker.is_alive()) and not self._stop.is_set():
+            self.worker = threading.Thread(target=self._worker, name="telegram-alerts", daemon=True)
+            self.worker.start()
 
-        self.worker = threading.Thread(target=self._worker, daemon=True)
-        self.worker.start()
+    def fingerprint(self, record) -> str:
+        if record.exc_info and record.exc_info[1] is not None:
+            exc_type, _, exc_tb = record.exc_info
+            frames = traceback.extract_tb(exc_tb)[-self.frames :]
+            parts = [exc_type.__qualname__] + [f"{frame.filename}:{frame.lineno}:{frame.name}" for frame in frames]
+        else:
+            parts = [record.name, record.pathname, str(record.lineno), str(record.levelno)]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
 
     def emit(self, record):
         try:
+            self._ensure_worker()
+            key = self.fingerprint(record)
+            with self._pending_lock:
+                group = self._pending.get(key)
+                if group is not None:
+                    group[1] += 1
+                    self._stats["coalesced"] += 1
+                    return
+                if len(self._pending) >= self.max_pending:
+                    self._stats["dropped"] += 1
+                    self._dropped_since_report += 1
+                    return
+
             # Prevent automatic traceback formatting (already in record.traceback via filter)
             original_exc_info = record.exc_info
             record.exc_info = None
@@ -31,29 +99,106 @@ class TelegramErrorHandler(logging.Handler):
             # Restore original exc_info for other handlers
             record.exc_info = original_exc_info
 
-            self.queue.put_nowait(msg)
-        except queue.Full:
-            pass  # drop or count dropped messages
+            with self._pending_lock:
+                group = self._pending.get(key)
+                if group is not None:
+                    # Opened by another thread meanwhile
+                    group[1] += 1
+                    self._stats["coalesced"] += 1
+                    return
+                self._pending[key] = [msg, 0]
+                self._new.append(msg)
+            self._wakeup.set()
+        except Exception:
+            self.handleError(record)
 
     def _worker(self):
         session = requests.Session()
-        while True:
-            msg = self.queue.get()
+        flush_at = time.monotonic() + self.window
+        while not self._stop.is_set():
+            self._wakeup.wait(max(flush_at - time.monotonic(), 0))
+            self._wakeup.clear()
+            self._send_new(session)
+            if time.monotonic() >= flush_at:
+                self._flush(session)
+                flush_at = time.monotonic() + self.window
+        self._send_new(session)
+        self._flush(session)
+
+    def _send_new(self, session):
+        with self._pending_lock:
+            messages, self._new = self._new, []
+        for msg in messages:
+            self._send(session, self._dropped_header() + msg)
+
+    def _flush(self, session):
+        """Report the repeats of the open groups, closing the groups that didn't repeat."""
+        repeated = []
+        with self._pending_lock:
+            for key, group in list(self._pending.items()):
+                if group[1]:
+                    repeated.append((group[0], group[1]))
+                    group[1] = 0
+                else:
+                    del self._pending[key]
+
+        for msg, count in repeated:
+            header = f"*Repeated:* {count} more times in the last {self.window}s\n"
+            self._send(session, self._dropped_header() + header + msg)
+
+    def _dropped_header(self) -> str:
+        with self._pending_lock:
+            dropped, self._dropped_since_report = self._dropped_since_report, 0
+        return f"*Dropped alerts:* {dropped}\n" if dropped else ""
+
+    def _count(self, stat: str) -> None:
+        with self._pending_lock:
+            self._stats[stat] += 1
+
+    def _send(self, session, text):
+        # Bounded, so a closing handler never hangs on a rate limit
+        for _ in range(3):
             try:
-                session.post(
+                response = session.post(
                     self.api_url,
                     json={
                         "chat_id": self.chat_id,
-                        "text": msg[:4000],
+                        "text": text[:4000],
                         "parse_mode": "Markdown",
                     },
-                    timeout=5,
+                    timeout=self.timeout,
                 )
             except Exception:
-                pass
-            finally:
-                self.queue.task_done()
+                break
+
+            if response.status_code == 429:
+                self._count("rate_limited")
+                try:
+                    retry_after = response.json()["parameters"]["retry_after"]
+                except (ValueError, KeyError, TypeError):
+                    retry_after = self.window
+                time.sleep(min(retry_after, self.window))
+                continue
+
+            if response.ok:
+                self._count("sent")
+                return
+            break
+
+        self._count("failed")
 
+    def get_stats(self) -> Dict[str, int]:
+        """Return the number of sent, coalesced, dropped and failed alerts, and the number of 429s."""
+        with self._pending_lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+    def close(self):
+        # Send the pending messages before exiting
+        self._stop.set()
+        self._wakeup.set()
+        if self.worker.is_alive() and self.worker is not threading.current_thread():
+            self.worker.join(self.timeout * 2)
+        super().close()
 
 
 class RequestContextFilter(logging.Filter):
@@ -65,7 +210,8 @@ class RequestContextFilter(logging.Filter):
         request = getattr(record, "request", None)
 
         if request:
-            record.user = getattr(request.user, "username", "Anonymous")
+            # API requests only get a user once DRF authenticates them
+            record.user = getattr(getattr(request, "user", None), "username", "Anonymous")
             record.method = request.method
             record.path = request.path
             record.ip = request.META.get("REMOTE_ADDR", "-")
@@ -76,11 +222,165 @@ class RequestContextFilter(logging.Filter):
             record.ip = "-"
 
         if record.exc_info:
-            exc_type, exc_value, exc_tb = record.exc_info
-            record.traceback = "".join(
-                traceback.format_exception(exc_type, exc_value, exc_tb)
-            )
+            # Only formatted if a handler's format uses %(traceback)s
+            record.traceback = LazyTraceback(record.exc_info)
         else:
             record.traceback = "No traceback"
 
         return True
+
+
+class LazyTraceback:
+    """
+    Traceback of a log record, formatted the first time it is converted to a string.
+    """
+
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = "".join(traceback.format_exception(*self.exc_info))
+        return self._text
+
+
+# ------------------------------------------------
+# QUEUE-BASED PIPELINE (one listener thread per process)
+# ------------------------------------------------
+
+_SENTINEL = None
+
+_log_queue: Optional[queue.Queue] = None
+_stats_lock = threading.Lock()
+_stats = {"dropped": 0, "processed": 0}
+
+
+def get_log_queue(maxsize: int = 10_000) -> queue.Queue:
+    """
+    Return the queue shared by all NonBlockingQueueHandlers of the process.
+
+    Used as the `queue` of the queue handlers in LOGGING, the first call creates it.
+    """
+    global _log_queue
+    if _log_queue is None:
+        _log_queue = queue.Queue(maxsize=maxsize)
+    return _log_queue
+
+
+class _LogDispatcher:
+    """
+    The single thread that handles queued records, started lazily in every process.
+
+    Items are (record, listener) pairs: each queue handler routes its records to the
+    handlers of its own listener, so one thread serves every queue handler.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+    def ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-dispatcher", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self) -> None:
+        log_queue = get_log_queue()
+        while True:
+            item = log_queue.get()
+            if item is _SENTINEL:
+                return
+            record, listener = item
+            try:
+                listener.handle(record)
+            except Exception:
+                # Handlers report their own errors through handleError(), never let the thread die
+                pass
+            with _stats_lock:
+                _stats["processed"] += 1
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Handle the records still queued and stop the thread, called at exit."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or self._pid != os.getpid():
+            return
+        try:
+            get_log_queue().put(_SENTINEL, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+
+_dispatcher = _LogDispatcher()
+atexit.register(_dispatcher.stop)
+
+
+class RoutedQueueListener(logging.handlers.QueueListener):
+    """
+    The handlers a NonBlockingQueueHandler routes its records to.
+
+    It has no thread of its own: records are handled by the shared dispatcher thread.
+    """
+
+    def start(self):
+        _dispatcher.ensure_started()
+
+    def stop(self):
+        pass
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks (nor formats) in the logging thread.
+
+    The record is only copied, with its message merged, and put on the shared queue;
+    formatting (including tracebacks), file writes, rotation and network calls happen
+    on the dispatcher thread. When the queue is full the record is dropped and counted,
+    see `get_queue_stats()`.
+
+    Configured in LOGGING like any QueueHandler:
+        "class": "core.utils.logging.NonBlockingQueueHandler",
+        "queue": {"()": "core.utils.logging.get_log_queue", "maxsize": ...},
+        "listener": "core.utils.logging.RoutedQueueListener",
+        "handlers": [...],
+        "respect_handler_level": True,
+    """
+
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare(), the record isn't formatted here and exc_info
+        # is kept: the queue never leaves the process, so nothing has to be pickled
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait((record, self.listener))
+        except queue.Full:
+            with _stats_lock:
+                _stats["dropped"] += 1
+
+    def emit(self, record):
+        _dispatcher.ensure_started()
+        super().emit(record)
+
+
+def get_queue_stats() -> Dict[str, int]:
+    """Return the number of queued, dropped and processed records of the process."""
+    log_queue = get_log_queue()
+    with _stats_lock:
+        return {
+            "queued": log_queue.qsize(),
+            "capacity": log_queue.maxsize,
+            **_stats,
+        }
@@ -0,0 +1,365 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the histogram buckets, the last bucket is +Inf
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "<unmatched>"
+OTHER_ROUTE = "<other>"
+
+
+class RouteMetrics:
+    """
+    Counters of one (route, method) pair, allocated once on its first request.
+    """
+
+    __slots__ = ("durations", "duration_sum", "sizes", "size_sum", "queries", "query_time", "statuses")
+
+    def __init__(self):
+        self.durations = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.queries = 0
+        self.query_time = 0.0
+        self.statuses: Dict[int, int] = {}
+
+    def to_dict(self) -> dict:
+        return {
+            "durations": list(self.durations),
+            "duration_sum": self.duration_sum,
+            "sizes": list(self.sizes),
+            "size_sum": self.size_sum,
+            "queries": self.queries,
+            "query_time": self.query_time,
+            "statuses": dict(self.statuses),
+        }
+
+
+class MetricsStore:
+    """
+    Per-process request metrics.
+
+    Every (route, method) pair gets its counters on its first request, after that recording
+    a request only increments them under a short lock, so memory doesn't grow with the number
+    of requests. Routes are the URL patterns (e.g. `api/v1/users/<int:pk>/`), never the paths,
+    and at most `max_routes` pairs are kept: further ones are recorded under `<other>`.
+    """
+
+    max_routes = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        duration: float,
+        size: Optional[int],
+        queries: int,
+        query_time: float,
+    ) -> None:
+        if method not in HTTP_METHODS:
+            method = "OTHER"
+        duration_index = bisect_left(DURATION_BUCKETS, duration)
+        size_index = bisect_left(SIZE_BUCKETS, size) if size is not None else None
+
+        with self._lock:
+            metrics = self._routes.get((route, method))
+            if metrics is None:
+                if len(self._routes) >= self.max_routes:
+                    route = OTHER_ROUTE
+                metrics = self._routes.get((route, method))
+                if metrics is None:
+                    metrics = self._routes[(route, method)] = RouteMetrics()
+            metrics.durations[duration_index] += 1
+            metrics.duration_sum += duration
+            if size_index is not None:
+                metrics.sizes[size_index] += 1
+                metrics.size_sum += size
+            metrics.queries += queries
+            metrics.query_time += query_time
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "routes": [[route, method, metrics.to_dict()] for (route, method), metrics in self._routes.items()],
+            }
+
+
+metrics_store = MetricsStore()
+
+# Gauges of the process, collected by the exporter thread: name prefix -> function returning {name: value}
+collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+def register_collector(prefix: str, collector: Callable[[], Dict[str, float]]) -> None:
+    """Export the values returned by `collector` as `<prefix>_<name>` gauges of every process."""
+    collectors[prefix] = collector
+
+
+def _log_queue_stats() -> Dict[str, float]:
+    from core.utils.logging import get_queue_stats
+
+    return get_queue_stats()
+
+
+def _hashing_stats() -> Dict[str, float]:
+    from core.utils.hashing import hashing_executor
+
+    return hashing_executor.stats()
+
+
+def _blacklist_stats() -> Dict[str, float]:
+    from core.api.blacklist import blacklist_filter
+
+    return blacklist_filter.stats()
+
+
+def _telegram_stats() -> Dict[str, float]:
+    handler = logging.getHandlerByName("telegram_errors")
+    return handler.get_stats() if handler is not None else {}
+
+
+def _db_pool_stats() -> Dict[str, float]:
+    from core.utils.db_pool import get_pool_stats
+
+    return get_pool_stats() or {}
+
+
+def _slow_query_stats() -> Dict[str, float]:
+    from core.utils.slow_queries import slow_query_stats
+
+    return {"dropped": slow_query_stats.dropped}
+
+
+register_collector("log_queue", _log_queue_stats)
+register_collector("password_hashing", _hashing_stats)
+register_collector("token_blacklist_filter", _blacklist_stats)
+register_collector("telegram_alerts", _telegram_stats)
+register_collector("slow_queries", _slow_query_stats)
+register_collector("db_pool", _db_pool_stats)
+
+
+def collect_gauges() -> Dict[str, float]:
+    gauges = {}
+    for prefix, collector in list(collectors.items()):
+        try:
+            values = collector()
+        except Exception:
+            logger.exception("Metrics collector %s failed", prefix)
+            continue
+        for name, value in values.items():
+            if isinstance(value, (int, float)):
+                gauges[f"{prefix}_{name}"] = value
+    return gauges
+
+
+def get_directory() -> Path:
+    return Path(settings.METRICS_DIR)
+
+
+class _MetricsExporter:
+    """
+    Thread writing the metrics of its process to `<METRICS_DIR>/<pid>.json` every
+    `METRICS_FLUSH_INTERVAL` seconds (and at exit), started lazily in every worker process.
+
+    The metrics endpoint merges the files of every process, so it reports the totals of all
+    the workers whichever one serves it. The files of exited processes keep counting towards
+    the counters but not the gauges; the directory is emptied when the server starts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.METRICS_FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self) -> None:
+        data = {"pid": os.getpid(), "written_at": time.time(), **metrics_store.snapshot(), "gauges": collect_gauges()}
+        directory = get_directory()
+        path = directory / f"{os.getpid()}.json"
+        # The thread and the metrics endpoint may flush at the same time
+        with self._flush_lock:
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(data))
+                os.replace(tmp_path, path)
+            except OSError:
+                logger.exception("Could not write the metrics to %s", path)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._pid == os.getpid():
+            self.flush()
+
+
+exporter = _MetricsExporter()
+atexit.register(exporter.stop)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def load_snapshots() -> List[dict]:
+    """Return the metrics of every process, with those of the current one up to date."""
+    exporter.flush()
+    snapshots = []
+    for path in sorted(get_directory().glob("*.json")):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        snapshot["alive"] = snapshot.get("pid") == os.getpid() or _is_alive(snapshot.get("pid", 0))
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _histogram(lines: List[str], name: str, bounds: Iterable[float], counts: List[int], total, labels: dict) -> None:
+    cumulative = 0
+    for bound, count in zip(list(bounds) + ["+Inf"], counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {total}")
+    lines.append(f"{name}_count{_labels(**labels)} {cumulative}")
+
+
+def render(snapshots: List[dict]) -> str:
+    """Merge the snapshots of the processes in the Prometheus text format."""
+    routes: Dict[Tuple[str, str], dict] = {}
+    in_flight = 0
+    for snapshot in snapshots:
+        if snapshot["alive"]:
+            in_flight += snapshot["in_flight"]
+        for route, method, values in snapshot["routes"]:
+            merged = routes.get((route, method))
+            if merged is None:
+                routes[(route, method)] = {**values, "statuses": dict(values["statuses"])}
+                continue
+            for key in ("durations", "sizes"):
+                merged[key] = [a + b for a, b in zip(merged[key], values[key])]
+            for key in ("duration_sum", "size_sum", "queries", "query_time"):
+                merged[key] += values[key]
+            for status, count in values["statuses"].items():
+                merged["statuses"][status] = merged["statuses"].get(status, 0) + count
+
+    lines = [
+        "# HELP http_requests_in_flight Requests being handled.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}",
+        "# HELP http_requests_total Handled requests.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (route, method), values in sorted(routes.items()):
+        for status, count in sorted(values["statuses"].items()):
+            lines.append(f"http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Time spent handling requests.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (route, method), values in sorted(routes.items()):
+        labels = {"route": route, "method": method}
+        _histogram(
+            lines,
+            "http_request_duration_seconds",
+            DURATION_BUCKETS,
+            values["durations"],
+            values["duration_sum"],
+            labels,
+        )
+
+    lines += [
+        "# HELP http_response_size_bytes Size of the (non-streaming) responses.",
+        "# TYPE http_response_size_bytes histogram",
+    ]
+    for (route, method), values in sorted(routes.items()):
+        labels = {"route": route, "method": method}
+        _histogram(lines, "http_response_size_bytes", SIZE_BUCKETS, values["sizes"], values["size_sum"], labels)
+
+    lines += ["# HELP db_queries_total Database queries run by requests.", "# TYPE db_queries_total counter"]
+    for (route, method), values in sorted(routes.items()):
+        lines.append(f"db_queries_total{_labels(route=route, method=method)} {values['queries']}")
+    lines += [
+        "# HELP db_query_duration_seconds_total Time spent in database queries by requests.",
+        "# TYPE db_query_duration_seconds_total counter",
+    ]
+    for (route, method), values in sorted(routes.items()):
+        lines.append(f"db_query_duration_seconds_total{_labels(route=route, method=method)} {values['query_time']}")
+
+    # Process gauges, only of the processes still running
+    gauges: Dict[str, List[Tuple[int, float]]] = {}
+    for snapshot in snapshots:
+        if snapshot["alive"]:
+            for name, value in snapshot.get("gauges", {}).items():
+                gauges.setdefault(name, []).append((snapshot["pid"], value))
+    for name, values in sorted(gauges.items()):
+        lines.append(f"# TYPE {name} gauge")
+        for pid, value in sorted(values):
+            lines.append(f"{name}{_labels(pid=pid)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def collect_metrics() -> str:
+    """Return the metrics of every process in the Prometheus text format."""
+    return render(load_snapshots())
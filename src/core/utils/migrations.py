@@ -0,0 +1,40 @@
+from django.contrib.postgres.operations import NotInTransactionMixin
+from django.db.migrations import AddConstraint
+
+
+class AddConstraintConcurrently(NotInTransactionMixin, AddConstraint):
+    """
+    Create a partial unique constraint using PostgreSQL's CREATE UNIQUE INDEX CONCURRENTLY.
+
+    Conditional unique constraints are backed by a unique index on PostgreSQL, so they can be
+    built without blocking writes to the table, the same way `AddIndexConcurrently` builds indexes.
+    Like `AddIndexConcurrently`, it can't run inside a transaction: the migration must set `atomic = False`.
+    """
+
+    atomic = False
+
+    def __init__(self, model_name, constraint):
+        if getattr(constraint, "condition", None) is None:
+            raise ValueError("AddConstraintConcurrently only supports conditional unique constraints.")
+        super().__init__(model_name, constraint)
+
+    def describe(self):
+        return "Concurrently create constraint %s on model %s" % (self.constraint.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            statement = self.constraint.create_sql(model, schema_editor)
+            statement.template = statement.template.replace(
+                "CREATE UNIQUE INDEX", "CREATE UNIQUE INDEX CONCURRENTLY", 1
+            )
+            schema_editor.execute(statement)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(
+                "DROP INDEX CONCURRENTLY IF EXISTS %s" % schema_editor.quote_name(self.constraint.name)
+            )
@@ -1,11 +1,201 @@
+import hashlib
+import json
+import time
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.query import ValuesIterable
+from django.utils.functional import cached_property
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+
+
+def _count_version_key(model) -> str:
+    return f"pagination:count-version:{model._meta.label_lower}"
+
+
+def invalidate_cached_counts(sender, **kwargs) -> None:
+    """Invalidate the cached counts of a model, connected to post_save and post_delete."""
+    try:
+        cache.incr(_count_version_key(sender))
+    except ValueError:
+        # No version yet, so nothing has been cached for the model
+        pass
+
+
+def get_cached_count(queryset: QuerySet, timeout: int) -> int:
+    """
+    Return the exact count of the queryset, cached per model and normalized filter set.
+
+    The cache key includes a per-model version that is bumped whenever an instance of
+    the model is saved or deleted (in bulk too, through `SoftDeleteQuerySet`), so the cached
+    number is never older than the last write made through the ORM. Bulk `update()` calls
+    only expire with the timeout.
+    """
+    version_key = _count_version_key(queryset.model)
+    version = cache.get(version_key)
+    if version is None:
+        # A fresh value, so counts cached under an evicted version are never reused
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(f"{sql}|{params!r}".encode()).hexdigest()
+    key = f"pagination:count:{queryset.model._meta.label_lower}:{version}:{digest}"
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+def get_estimated_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Return the PostgreSQL planner estimate of the number of rows of the queryset.
+
+    Unfiltered querysets use `pg_class.reltuples`, filtered ones the row estimate of `EXPLAIN`.
+    Returns None when no estimate is available (other databases, never analyzed tables).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Django Paginator whose total count is produced by a configurable strategy.
+
+    After `count` is evaluated, `count_strategy` holds the strategy that actually
+    produced the number (estimates below the threshold fall back to an exact count).
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_strategy: str = COUNT_EXACT,
+        cache_timeout: int = 60,
+        estimate_threshold: int = 100_000,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.cache_timeout = cache_timeout
+        self.estimate_threshold = estimate_threshold
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            self.count_strategy = COUNT_EXACT
+            return len(self.object_list)
+
+        if self.count_strategy == COUNT_ESTIMATED:
+            estimate = get_estimated_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+            self.count_strategy = COUNT_EXACT
+
+        if self.count_strategy == COUNT_CACHED:
+            return get_cached_count(self.object_list, self.cache_timeout)
+
+        self.count_strategy = COUNT_EXACT
+        return self.object_list.count()
+
 
 class CustomPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination with a configurable total count strategy.
+
+    `count_strategy` (overridable per view with a `count_strategy` attribute) is one of:
+        - "exact": COUNT(*) on every request
+        - "cached": exact count cached per normalized filter set, see `get_cached_count`
+        - "estimated": PostgreSQL planner estimate for results above `count_estimate_threshold` rows
+    The response reports the strategy that produced `total_count`.
+    """
+
     page_size = 10
     page_query_param = "page"
     page_size_query_param = "per_page"
+    count_strategy = COUNT_EXACT
+    count_cache_timeout = 60
+    count_estimate_threshold = 100_000
+
+    def django_paginator_class(self, object_list, per_page):
+        return CountStrategyPaginator(
+            object_list,
+            per_page,
+            count_strategy=self.current_count_strategy,
+            cache_timeout=self.count_cache_timeout,
+            estimate_threshold=self.count_estimate_threshold,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.current_count_strategy = getattr(view, "count_strategy", None) or self.count_strategy
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of `paginate_queryset` for async views.
+
+        Exact counts and the page itself are fetched with the async ORM, the cached
+        and estimated strategies still run their queries in a thread.
+        """
+        self.current_count_strategy = getattr(view, "count_strategy", None) or self.count_strategy
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        if paginator.count_strategy == COUNT_EXACT and isinstance(queryset, QuerySet):
+            # Primes the cached_property, so the paginator never counts by itself
+            paginator.count = await queryset.acount()
+        else:
+            await sync_to_async(lambda: paginator.count)()
+
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        if isinstance(self.page.object_list, QuerySet):
+            self.page.object_list = [obj async for obj in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
 
     def get_paginated_response(self, data):
         return Response(
@@ -14,6 +204,7 @@ class CustomPagination(pagination.PageNumberPagination):
                 "message": "OK",
                 "results": data,
                 "total_count": self.page.paginator.count,
+                "count_strategy": self.page.paginator.count_strategy,
                 "page": self.page.number,
                 "page_count": self.page.paginator.num_pages,
                 "per_page": self.page.paginator.per_page,
@@ -21,4 +212,58 @@ class CustomPagination(pagination.PageNumberPagination):
         )
 
     def paginated_queryset(self, qs, request):
-        return super(CustomPagination, self).paginate_queryset(qs, request)
+        return self.paginate_queryset(qs, request)
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Keyset (cursor) pagination over the indexed `created_at` column, with `id` as a tie-breaker.
+
+    Pages are fetched with `WHERE created_at < <position>` instead of an OFFSET scan,
+    and the next/previous cursors are opaque tokens. COUNT(*) is never run unless
+    the client explicitly asks for a total with `?with_total=true`.
+    """
+
+    page_size = 10
+    page_size_query_param = "per_page"
+    ordering = ("-created_at", "-id")
+    total_query_param = "with_total"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total_count = None
+        if request.query_params.get(self.total_query_param, "").lower() in ("1", "true"):
+            self.total_count = queryset.count()
+
+        # `.values()` querysets (see PaginatedListMixin.values_fields) must select the ordering
+        # columns too, the cursors are built from them. They are left out of the returned rows.
+        fields = getattr(queryset, "_fields", None)
+        extra_fields = ()
+        if fields and issubclass(queryset._iterable_class, ValuesIterable):
+            extra_fields = tuple(
+                name for name in (field.lstrip("-") for field in self.get_ordering(request, queryset, view))
+                if name not in fields
+            )
+            if extra_fields:
+                queryset = queryset.values(*fields, *extra_fields)
+
+        page = super().paginate_queryset(queryset, request, view)
+        if page and extra_fields:
+            # Copies, the page itself still has them for get_next_link() and get_previous_link()
+            page = [{key: value for key, value in row.items() if key not in extra_fields} for row in page]
+        return page
+
+    def get_paginated_response(self, data):
+        response_data = {
+            "success": True,
+            "message": "OK",
+            "results": data,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "per_page": self.page_size,
+        }
+        if self.total_count is not None:
+            response_data["total_count"] = self.total_count
+        return Response(response_data)
+
+    def paginated_queryset(self, qs, request):
+        return self.paginate_queryset(qs, request)
@@ -0,0 +1,205 @@
+import atexit
+import json
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+_SIGNER_SALT = "core.utils.profiling"
+_SIGNED_VALUE = "profile"
+_STDLIB = sysconfig.get_paths()["stdlib"]
+# Innermost frames of threads waiting for work: the event loop and the executor of sync views
+_IDLE_FRAMES = {("selectors.py", "select"), (os.path.join("concurrent", "futures", "thread.py"), "_worker")}
+
+
+def sign_profile_header() -> str:
+    """Return a value of the `X-Profile` header that profiles requests until it expires."""
+    return TimestampSigner(salt=_SIGNER_SALT).sign(_SIGNED_VALUE)
+
+
+def is_signed_profile_header(value: str) -> bool:
+    try:
+        signed = TimestampSigner(salt=_SIGNER_SALT).unsign(value, max_age=settings.PROFILING_SIGNATURE_MAX_AGE)
+    except BadSignature:
+        return False
+    return signed == _SIGNED_VALUE
+
+
+def is_stdlib(filename: str) -> bool:
+    return filename.startswith(_STDLIB) and "site-packages" not in filename
+
+
+@lru_cache(maxsize=None)
+def is_idle(code) -> bool:
+    if not is_stdlib(code.co_filename):
+        return False
+    return (os.path.relpath(code.co_filename, _STDLIB), code.co_name) in _IDLE_FRAMES
+
+
+def frame_name(code) -> str:
+    """`path/to/module.py:Class.function`, with the path relative to site-packages, the project or the stdlib."""
+    filename = code.co_filename
+    if "site-packages" in filename:
+        filename = filename.rsplit("site-packages", 1)[1].lstrip(os.sep)
+    else:
+        for root in (str(settings.BASE_DIR), _STDLIB):
+            if filename.startswith(root):
+                filename = os.path.relpath(filename, root)
+                break
+    return f"{filename}:{code.co_qualname}"
+
+
+class RequestProfile:
+    """
+    Stack sampler of one request.
+
+    While started, a thread reads the stacks of the registered threads every `interval`
+    seconds (`sys._current_frames()`) and counts them. Nothing runs for requests that
+    aren't profiled. Samples of idle threads (the sync view thread waiting for work, the
+    event loop waiting in `select`) are skipped; under ASGI the event loop thread also runs
+    other requests, whose stacks end up in the profile too.
+    """
+
+    max_depth = 128
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._threads: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_current_thread(self) -> None:
+        self._threads.add(threading.get_ident())
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self._threads:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._sample(frame)
+
+    def _sample(self, frame) -> None:
+        if is_idle(frame.f_code):
+            return
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack.reverse()
+        self.samples[tuple(stack)] += 1
+
+    def collapsed(self) -> Dict[str, int]:
+        """Return the samples as collapsed stacks ("outer;...;inner" -> count), the flame graph input."""
+        names = {}
+        collapsed: Counter = Counter()
+        for stack, count in self.samples.items():
+            for code in stack:
+                if code not in names:
+                    names[code] = frame_name(code)
+            collapsed[";".join(names[code] for code in stack)] += count
+        return collapsed
+
+
+class ProfileStore:
+    """
+    Collapsed stacks of the profiled requests of the process, by view.
+
+    Written to `<directory>/<pid>.json` at most every `flush_interval` seconds and at exit,
+    merged by the `dump_profiles` management command.
+    """
+
+    flush_interval = 10
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._directory = directory
+        self._views: Dict[str, Counter] = {}
+        self._requests: Counter = Counter()
+        self._flushed_at = 0.0
+        self._dirty = False
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = Path(settings.BASE_DIR).parent / "logs" / "profiles"
+        return self._directory
+
+    def add(self, view: str, collapsed: Dict[str, int]) -> None:
+        with self._lock:
+            self._views.setdefault(view, Counter()).update(collapsed)
+            self._requests[view] += 1
+            self._dirty = True
+            flush = time.monotonic() - self._flushed_at >= self.flush_interval
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._flushed_at = time.monotonic()
+            data = {
+                "pid": os.getpid(),
+                "views": {
+                    view: {"requests": self._requests[view], "stacks": dict(stacks)}
+                    for view, stacks in self._views.items()
+                },
+            }
+        path = self.directory / f"{os.getpid()}.json"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception("Could not write the profiles to %s", path)
+
+
+profile_store = ProfileStore()
+atexit.register(profile_store.flush)
+
+
+def merge_profiles(directory: Optional[Path] = None) -> Dict[str, Tuple[int, Counter]]:
+    """Merge the profiles written by every process: view -> (profiled requests, collapsed stacks)."""
+    directory = directory or profile_store.directory
+    merged: Dict[str, Tuple[int, Counter]] = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            views = json.loads(path.read_text())["views"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for view, profile in views.items():
+            requests, stacks = merged.get(view, (0, Counter()))
+            stacks.update(profile["stacks"])
+            merged[view] = (requests + profile["requests"], stacks)
+    return merged
+
+
+def to_collapsed(stacks: Dict[str, int], root: Optional[str] = None) -> Iterable[str]:
+    """Lines of the collapsed stack format read by flamegraph.pl, speedscope or inferno."""
+    for stack, count in sorted(stacks.items()):
+        yield f"{root};{stack} {count}" if root else f"{stack} {count}"
@@ -0,0 +1,85 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+from core.utils.slow_queries import normalize_sql
+
+# Query stats of the request being measured, None when the request isn't sampled
+current_query_stats: ContextVar[Optional["QueryStats"]] = ContextVar("current_query_stats", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode (`QUERY_BUDGET_STRICT`) when a view runs more queries than its budget."""
+
+
+class QueryStats:
+    """
+    Number of queries, time spent in the database and executions per statement of a request.
+
+    With `track_statements=False` only the number of queries and the time are kept, so the
+    stats stay the same size however many queries run (see `core.middlewares.metrics.MetricsMiddleware`).
+    """
+
+    def __init__(self, track_statements: bool = True):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+    def record(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements[sql] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def get_repeated(self, threshold: int) -> List[Tuple[str, str, int]]:
+        """
+        Return the (fingerprint, normalized SQL, count) of the queries run at least `threshold` times,
+        most repeated first. The same query with different parameters (one query per row of
+        a list, i.e. an N+1) has a single fingerprint.
+        """
+        fingerprints: Counter = Counter()
+        normalized = {}
+        for sql, count in (self.statements or {}).items():
+            fingerprint, normalized[fingerprint] = normalize_sql(sql)
+            fingerprints[fingerprint] += count
+        return [
+            (fingerprint, normalized[fingerprint], count)
+            for fingerprint, count in fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+def query_stats_wrapper(execute, sql, params, many, context):
+    """
+    `connection.execute_wrapper` adding the queries to `current_query_stats`.
+
+    Outside of a measured request it costs a single context variable lookup. Fingerprints
+    are only computed at the end of the request, once per distinct statement.
+    """
+    stats = current_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - start)
+
+
+def install(sender=None, connection=None, **kwargs) -> None:
+    """`connection_created` receiver adding the query stats wrapper to the connection, once."""
+    if is_enabled() and query_stats_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_stats_wrapper)
+
+
+@lru_cache(maxsize=None)
+def is_enabled() -> bool:
+    return settings.METRICS_ENABLED or settings.QUERY_BUDGET_STRICT or settings.QUERY_BUDGET_SAMPLE_RATE > 0
@@ -0,0 +1,327 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from core.utils.context import get_request_context
+
+logger = logging.getLogger(__name__)
+
+# Set while a sampled EXPLAIN runs, so the wrapper doesn't instrument its own query
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+SLOW_QUERY_MESSAGE = "Slow query %s (%.1f ms) in %s [%s %s, user: %s]: %s"
+
+_NORMALIZE_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%s|%\(\w+\)s"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE), "IN (...)"),
+    # Multi-row VALUES of bulk inserts
+    (re.compile(r"(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+"), r"\1, ..."),
+    (re.compile(r"\s+"), " "),
+]
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> Tuple[str, str]:
+    """
+    Return the fingerprint and the normalized form of a statement.
+
+    Literals, placeholders and IN lists are replaced so every execution of the same
+    query (e.g. a queryset with different filter values) gets the same fingerprint.
+    """
+    normalized = sql
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = normalized.strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of the values, 0 when there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class SlowQueryStats:
+    """
+    Per-process aggregates of the slow queries, by fingerprint.
+
+    Every fingerprint keeps its count, total and max duration plus the `max_samples` most
+    recent durations, from which p50/p99 are computed. Only queries above the threshold are
+    recorded, so the percentiles are those of the slow executions. Snapshots are written to
+    `<directory>/<pid>.json` by `slow_query_worker` every `flush_interval` seconds and at exit,
+    so the `slow_queries` management command can merge the numbers of every worker process.
+    """
+
+    max_samples = 256
+    max_fingerprints = 1000
+    flush_interval = 10
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._directory = directory
+        self._aggregates: Dict[str, dict] = {}
+        self._dirty = False
+        self.dropped = 0
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = Path(settings.BASE_DIR).parent / "logs" / "slow_queries"
+        return self._directory
+
+    def record(self, fingerprint: str, sql: str, duration_ms: float, view: str) -> None:
+        with self._lock:
+            aggregate = self._aggregates.get(fingerprint)
+            if aggregate is None:
+                if len(self._aggregates) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                aggregate = self._aggregates[fingerprint] = {
+                    "sql": sql,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "samples": deque(maxlen=self.max_samples),
+                    "views": {},
+                }
+            aggregate["count"] += 1
+            aggregate["total_ms"] += duration_ms
+            aggregate["max_ms"] = max(aggregate["max_ms"], duration_ms)
+            aggregate["samples"].append(duration_ms)
+            aggregate["views"][view] = aggregate["views"].get(view, 0) + 1
+            self._dirty = True
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                fingerprint: {**aggregate, "samples": list(aggregate["samples"]), "views": dict(aggregate["views"])}
+                for fingerprint, aggregate in self._aggregates.items()
+            }
+
+    def flush(self) -> None:
+        """Write the snapshot of this process, atomically so readers never see a partial file."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        data = {"pid": os.getpid(), "written_at": time.time(), "queries": self.snapshot()}
+        path = self.directory / f"{os.getpid()}.json"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception("Could not write the slow query snapshot to %s", path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._aggregates.clear()
+            self._dirty = False
+            self.dropped = 0
+
+
+slow_query_stats = SlowQueryStats()
+atexit.register(slow_query_stats.flush)
+
+
+def explain(connection, sql: str, params) -> Optional[str]:
+    """Return the plan of a SELECT, or None if the database can't explain it."""
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+    except (DatabaseError, NotImplementedError, ValueError):
+        return None
+    finally:
+        _explaining.reset(token)
+
+
+class SlowQueryWorker:
+    """
+    Background thread of the process running the sampled EXPLAINs and writing the snapshots.
+
+    Keeps database round trips and file I/O out of the request. The EXPLAINs run on the
+    thread's own connections (Django connections are per thread), outside of the transaction
+    of the request, so they never add savepoints to it nor count towards its query budget,
+    and only see committed data. At most `max_pending` EXPLAINs wait, further ones are skipped.
+    """
+
+    max_pending = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(self.max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+    def ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            # Threads don't survive a fork, restart it in worker processes
+            if self._pid != os.getpid() or self._thread is None:
+                self._queue = queue.Queue(self.max_pending)
+                self._thread = threading.Thread(target=self._run, name="slow-queries", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def submit_explain(self, alias: str, sql: str, params, log_args: tuple) -> bool:
+        """Log the slow query with its plan once explained, returning False when too many are waiting."""
+        self.ensure_started()
+        try:
+            self._queue.put_nowait((alias, sql, params, log_args))
+        except queue.Full:
+            return False
+        return True
+
+    def join(self) -> None:
+        """Wait until the submitted EXPLAINs are logged."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        flushed_at = time.monotonic()
+        while True:
+            timeout = max(flushed_at + slow_query_stats.flush_interval - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                self._explain(*item)
+            if time.monotonic() - flushed_at >= slow_query_stats.flush_interval:
+                slow_query_stats.flush()
+                flushed_at = time.monotonic()
+
+    def _explain(self, alias: str, sql: str, params, log_args: tuple) -> None:
+        try:
+            connection = connections[alias]
+            plan = explain(connection, sql, params)
+            if self._queue.empty():
+                # Don't hold a connection while idle
+                connection.close()
+            logger.warning(SLOW_QUERY_MESSAGE + "\nEXPLAIN:\n%s", *log_args, plan or "-")
+        except Exception:
+            logger.exception("Could not explain a slow query")
+        finally:
+            self._queue.task_done()
+
+
+slow_query_worker = SlowQueryWorker()
+
+
+class SlowQueryWrapper:
+    """
+    `connection.execute_wrapper` that records the queries slower than `SLOW_QUERY_THRESHOLD_MS`.
+
+    Queries below the threshold cost two `perf_counter` calls. Slow (successful) ones are fingerprinted,
+    added to `slow_query_stats` and logged with their duration and the view that ran them;
+    a `SLOW_QUERY_EXPLAIN_SAMPLE_RATE` fraction of slow SELECTs are logged with their EXPLAIN
+    instead, by `slow_query_worker`.
+    Installed on every connection by `install`, see `CoreConfig.ready`.
+    """
+
+    def __init__(self, threshold_ms: float, explain_rate: float = 0.0):
+        self.threshold = threshold_ms / 1000
+        self.explain_rate = explain_rate
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration >= self.threshold and not _explaining.get():
+            self.record(sql, params, many, context["connection"], duration * 1000)
+        return result
+
+    def record(self, sql, params, many, connection, duration_ms: float) -> None:
+        try:
+            fingerprint, normalized = normalize_sql(sql)
+            request_context = get_request_context()
+            slow_query_stats.record(fingerprint, normalized, duration_ms, request_context["view"])
+            slow_query_worker.ensure_started()
+
+            log_args = (
+                fingerprint,
+                duration_ms,
+                request_context["view"],
+                request_context["method"],
+                request_context["path"],
+                request_context["user"],
+                normalized,
+            )
+            if (
+                not many
+                and self.explain_rate
+                and random.random() < self.explain_rate
+                and sql.lstrip()[:6].upper() == "SELECT"
+                and slow_query_worker.submit_explain(connection.alias, sql, params, log_args)
+            ):
+                return
+            logger.warning(SLOW_QUERY_MESSAGE, *log_args)
+        except Exception:
+            # Instrumentation must never break the query it measures
+            logger.exception("Could not record a slow query")
+
+
+def install(sender=None, connection=None, **kwargs) -> None:
+    """`connection_created` receiver adding the slow query wrapper to the connection, once."""
+    wrapper = get_wrapper()
+    if wrapper is not None and wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(wrapper)
+
+
+@lru_cache(maxsize=None)
+def get_wrapper() -> Optional[SlowQueryWrapper]:
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return None
+    return SlowQueryWrapper(settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE)
+
+
+def merge_snapshots(directory: Optional[Path] = None) -> Dict[str, dict]:
+    """
+    Merge the snapshots written by every process into one aggregate per fingerprint,
+    with p50/p99 computed over the samples of all of them.
+    """
+    directory = directory or slow_query_stats.directory
+    merged: Dict[str, dict] = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            queries = json.loads(path.read_text())["queries"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for fingerprint, aggregate in queries.items():
+            target = merged.setdefault(
+                fingerprint,
+                {"sql": aggregate["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": [], "views": {}},
+            )
+            target["count"] += aggregate["count"]
+            target["total_ms"] += aggregate["total_ms"]
+            target["max_ms"] = max(target["max_ms"], aggregate["max_ms"])
+            target["samples"].extend(aggregate["samples"])
+            for view, count in aggregate["views"].items():
+                target["views"][view] = target["views"].get(view, 0) + count
+
+    for aggregate in merged.values():
+        aggregate["p50_ms"] = percentile(aggregate["samples"], 0.5)
+        aggregate["p99_ms"] = percentile(aggregate["samples"], 0.99)
+    return merged
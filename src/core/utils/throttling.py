@@ -0,0 +1,176 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucket:
+    """
+    Per-process token buckets, one per key.
+
+    Every bucket holds up to `capacity` tokens and is refilled with `refill_rate` tokens
+    per second. The state of a bucket is an immutable (tokens, updated_at) tuple replaced
+    with a single dict assignment, so no lock is taken: under a race two requests may both
+    spend the same token, which only makes the limit slightly more lenient.
+    Buckets that refilled completely are dropped once there are more than `max_keys`.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _available(self, key: str, now: float) -> float:
+        state = self._buckets.get(key)
+        if state is None:
+            return self.capacity
+        tokens, updated_at = state
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+    def consume(self, key: str, tokens: float = 1) -> bool:
+        """Take tokens from the bucket of the key, returning False (and taking nothing) if there are not enough."""
+        now = time.monotonic()
+        available = self._available(key, now)
+        if available < tokens:
+            return False
+        self._buckets[key] = (available - tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._evict(now)
+        return True
+
+    def refund(self, key: str, tokens: float = 1) -> None:
+        """Give back tokens taken from the bucket of the key."""
+        state = self._buckets.get(key)
+        if state is not None:
+            self._buckets[key] = (min(self.capacity, state[0] + tokens), state[1])
+
+    def wait(self, key: str, tokens: float = 1) -> float:
+        """Return the number of seconds until the bucket of the key holds enough tokens."""
+        missing = tokens - self._available(key, time.monotonic())
+        return max(missing, 0) / self.refill_rate
+
+    def _evict(self, now: float) -> None:
+        full_after = self.capacity / self.refill_rate
+        for key, (_, updated_at) in list(self._buckets.items()):
+            if now - updated_at >= full_after:
+                self._buckets.pop(key, None)
+        if len(self._buckets) > self.max_keys:
+            # Still under attack from too many keys, forget everything rather than grow without bound
+            self._buckets.clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle backed by per-process token buckets, with an optional shared backend.
+
+    The rate of `throttle_scope` comes from DEFAULT_THROTTLE_RATES ("<requests>/<period>"),
+    which is both the burst size and the refill rate of the buckets. A request is throttled
+    as soon as any of the keys returned by `get_keys` runs out of tokens, before the view
+    does any work. A rejected request spends no token from any bucket, so a throttled
+    username doesn't drain the bucket of the IP and the other way around.
+
+    With `shared_cache` set to a cache alias, the same limit is also enforced across
+    processes with an atomic fixed-window counter in that cache (any shared Django cache
+    backend, e.g. Redis); the local bucket still rejects most excess requests without
+    a round trip to the cache.
+
+    Use it from any view (e.g. a BaseAPIView subclass) by setting `throttle_classes`
+    and `throttle_scope`, or subclass it to change the keys.
+    """
+
+    shared_cache: Optional[str] = None
+    cache_key_prefix = "throttle"
+
+    _buckets: Dict[str, TokenBucket] = {}
+
+    def get_rate(self, view) -> Tuple[int, int]:
+        scope = getattr(view, "throttle_scope", None)
+        try:
+            rate = api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{scope}' scope")
+        num, period = rate.split("/")
+        duration = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), duration
+
+    def get_keys(self, request, view) -> List[str]:
+        """Return the keys whose buckets the request spends a token from."""
+        return [f"ip:{self.get_ident(request)}"]
+
+    def get_bucket(self, view) -> TokenBucket:
+        scope = getattr(view, "throttle_scope", None)
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            num_requests, duration = self.get_rate(view)
+            bucket = self._buckets.setdefault(scope, TokenBucket(num_requests, num_requests / duration))
+        return bucket
+
+    def allow_request(self, request, view):
+        bucket = self.get_bucket(view)
+        keys = self.get_keys(request, view)
+        self.wait_time = max((bucket.wait(key) for key in keys), default=0.0)
+        if self.wait_time:
+            return False
+
+        consumed = [key for key in keys if bucket.consume(key)]
+        if len(consumed) < len(keys) or (self.shared_cache and not self.allow_shared(view, keys)):
+            # Emptied by a concurrent request, or over the shared limit
+            for key in consumed:
+                bucket.refund(key)
+            self.wait_time = self.wait_time or max(bucket.wait(key) for key in keys)
+            return False
+        return True
+
+    def allow_shared(self, view, keys: List[str]) -> bool:
+        """Count the request for every key in the shared cache, uncounting it if any key is over the limit."""
+        num_requests, duration = self.get_rate(view)
+        now = time.time()
+        window = int(now // duration)
+        cache = caches[self.shared_cache]
+        counted = []
+        for key in keys:
+            cache_key = f"{self.cache_key_prefix}:{view.throttle_scope}:{key}:{window}"
+            cache.add(cache_key, 0, duration)
+            try:
+                count = cache.incr(cache_key)
+            except ValueError:
+                # Expired between add() and incr()
+                continue
+            counted.append(cache_key)
+            if count > num_requests:
+                self.wait_time = (window + 1) * duration - now
+                for counted_key in counted:
+                    try:
+                        cache.decr(counted_key)
+                    except ValueError:
+                        pass
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_time or None
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """
+    Limits login attempts per client IP and per attempted username.
+
+    The username bucket stops credential stuffing against a single account from many IPs,
+    the IP bucket stops a single client from trying many accounts. Attempts are rejected
+    before the credentials are validated, so rejected attempts cost no password hashing.
+    """
+
+    shared_cache = "default"
+
+    def get_keys(self, request, view) -> List[str]:
+        keys = super().get_keys(request, view)
+        data = request.data
+        username = data.get(get_user_model().USERNAME_FIELD) if hasattr(data, "get") else None
+        if isinstance(username, str) and username.strip():
+            keys.append(f"username:{username.strip().lower()}")
+        return keys
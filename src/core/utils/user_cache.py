@@ -0,0 +1,123 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+def _version_key(user_id) -> str:
+    return f"auth:user-version:{user_id}"
+
+
+def user_cache_key(user_id, version: int) -> str:
+    return f"auth:user:{user_id}:{version}"
+
+
+def is_cache_shared() -> bool:
+    """
+    Return whether the default cache is shared by all the processes.
+
+    Versions bumped in a per-process cache (LocMemCache) never reach the other workers,
+    which would keep serving changed users, so `CachedJWTAuthentication` doesn't cache then.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def get_user_version(user_id) -> int:
+    """
+    Return the current version of the user, embedded in issued tokens as the "ver" claim.
+
+    The version changes whenever the user is saved or deleted, so cached copies of the
+    user are only ever served to tokens issued (or refreshed) after the last change.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh value, so users cached under an evicted version are never reused
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_cached_user(user_id, version: int) -> Tuple[bool, Optional[object]]:
+    """
+    Return whether the version is the current one and the user cached for it, if any.
+
+    Both the version and the user are read in a single round trip to the shared cache.
+    """
+    version_key = _version_key(user_id)
+    user_key = user_cache_key(user_id, version)
+    values = cache.get_many([version_key, user_key])
+    if values.get(version_key) != version:
+        return False, None
+    return True, values.get(user_key)
+
+
+def invalidate_users(user_ids: Iterable) -> None:
+    """
+    Invalidate the cached copies of the users once the current transaction commits.
+
+    Called by `User.save()`, `User.delete()` and the bulk operations of `UserQuerySet`.
+    Raw SQL and `QuerySet._update()` bypass them and have to call it explicitly.
+    """
+    user_ids = list(user_ids)
+
+    def bump():
+        cache.set_many({_version_key(user_id): time.time_ns() for user_id in user_ids}, None)
+        for user_id in user_ids:
+            local_user_cache.pop(user_id)
+
+    transaction.on_commit(bump)
+
+
+class LocalUserCache:
+    """
+    Small per-process LRU of authenticated users, keyed by user id and version.
+
+    Entries expire after `ttl` seconds, which bounds how long another process may keep
+    serving a user after it changed. Returned users are copies, so a request never
+    mutates the cached instance. User ids are normalized to strings, as in token claims.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version: int):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            entry_version, user, expires_at = entry
+            if entry_version != version or expires_at < time.monotonic():
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, version: int, user) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            self._entries[user_id] = (version, copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, user_id) -> Optional[object]:
+        with self._lock:
+            entry = self._entries.pop(str(user_id), None)
+        return entry and entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_user_cache = LocalUserCache()
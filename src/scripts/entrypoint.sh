@@ -7,6 +7,9 @@ python manage.py migrate
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+echo "Clearing metrics of previous runs..."
+rm -rf "${METRICS_DIR:-../logs/metrics}"
+
 echo "Starting server..."
 python -m uvicorn config.server.asgi:application --host 0.0.0.0 --port 8000 --workers 4 --lifespan off
 